@@ -1,21 +1,292 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
+from functools import wraps
+import csv
+import hmac
+import io
 import sys
 import os
+import threading
+import time
 
-# Adicionar o diretório do modelo ao path
+# Adicionar os diretórios do modelo e da base de usuários ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ml_model'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'chatbot'))
 
-from model import ProjectSuccessPredictor
+from inference import PROJECT_FIELDS, ProjectPredictor
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache
+from request_schema import ProjectSchema
+from json_provider import FastJSONProvider
+from metrics import BATCH_SIZE_BUCKETS, MetricsRegistry
+from request_profiler import RequestProfiler
+from micro_batcher import MicroBatcher
+from user_store import UserStore
+import recommendations
 
 app = Flask(__name__)
 CORS(app)
 
+# Serialização JSON com orjson, quando instalado
+app.json = FastJSONProvider(app)
+
+# Métricas do processo, exportadas em /metrics no formato do Prometheus
+metrics = MetricsRegistry()
+REQUESTS_TOTAL = metrics.counter(
+    'api_requests_total', 'Requisições atendidas', ['endpoint', 'method', 'status'])
+REQUEST_DURATION = metrics.histogram(
+    'api_request_duration_seconds', 'Duração das requisições', ['endpoint'])
+STAGE_DURATION = metrics.histogram(
+    'api_stage_duration_seconds', 'Duração das etapas de validação, inferência e serialização', ['endpoint', 'stage'])
+BATCH_SIZE = metrics.histogram(
+    'api_batch_size', 'Projetos avaliados por chamada ao modelo', ['endpoint'], buckets=BATCH_SIZE_BUCKETS)
+MODEL_LOAD_DURATION = metrics.histogram(
+    'api_model_load_duration_seconds', 'Duração do carregamento e do aquecimento de modelos', ['stage'])
+MODEL_LOADS_TOTAL = metrics.counter(
+    'api_model_loads_total', 'Tentativas de carregamento de modelo', ['result'])
+PREDICTION_CACHE_GAUGE = metrics.gauge(
+    'api_prediction_cache', 'Contadores do cache de previsões', ['field'])
+REJECTED_REQUESTS_GAUGE = metrics.gauge(
+    'api_rejected_requests', 'Requisições recusadas com 503 pelo limite de concorrência')
+MICRO_BATCH_WAIT = metrics.histogram(
+    'api_micro_batch_wait_seconds', 'Espera da primeira requisição de cada micro-lote até a avaliação')
+
+# Perfilamento com cProfile de uma fração das requisições (0 desativa)
+request_profiler = RequestProfiler(
+    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', '0')),
+    output_dir=os.environ.get('PROFILE_DIR', os.path.join(os.path.dirname(__file__), 'profiles'))
+)
+
 # Inicializar o preditor
-predictor = ProjectSuccessPredictor()
+predictor = ProjectPredictor()
+
+# Carregar modelo treinado (um .pkl ou um diretório de artefato salvo com save_artifact)
+MODEL_PATH = os.environ.get(
+    'MODEL_PATH', os.path.join(os.path.dirname(__file__), '..', 'ml_model', 'project_success_model.pkl'))
+
+# Modo de mapeamento em memória dos arrays da floresta ('' desativa)
+MODEL_MMAP_MODE = os.environ.get('MODEL_MMAP_MODE', 'r') or None
+
+# Confere os checksums do artefato ao carregá-lo (MODEL_VERIFY_CHECKSUM=0 desativa)
+MODEL_VERIFY_CHECKSUM = os.environ.get('MODEL_VERIFY_CHECKSUM', '1') == '1'
+
+# Pré-computa a tabela de probabilidades do espaço de features (MODEL_PREDICTION_GRID=1);
+# modelos cuja tabela excede MODEL_GRID_MAX_CELLS continuam usando a floresta
+MODEL_PREDICTION_GRID = os.environ.get('MODEL_PREDICTION_GRID', '0') == '1'
+MODEL_GRID_MAX_CELLS = int(os.environ.get('MODEL_GRID_MAX_CELLS', '1000000'))
+
+# Registro de modelos versionados; sem ele, a API usa MODEL_PATH
+MODEL_REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR')
+model_registry = ModelRegistry(MODEL_REGISTRY_DIR) if MODEL_REGISTRY_DIR else None
+
+# Intervalo de verificação de novas versões no registro (0 desativa)
+MODEL_REGISTRY_POLL_SECONDS = float(os.environ.get('MODEL_REGISTRY_POLL_SECONDS', '0'))
+
+# Projeto usado para aquecer um modelo antes de colocá-lo em produção
+WARMUP_PROJECT = {'duracao': 8, 'orcamento': 650000, 'tamanho_equipe': 12, 'recursos': 'Alto'}
+
+# Serializa as trocas de modelo; as requisições nunca aguardam este lock
+_reload_lock = threading.Lock()
+
+# Versão fixada por um /admin/reload com versão explícita (rollback); enquanto
+# definida, o observador do registro não volta para LATEST
+pinned_version = None
+
+# Token exigido pelos endpoints /admin (cabeçalho "Authorization: Bearer <token>");
+# sem ele, esses endpoints só aceitam requisições de localhost
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+LOCAL_ADDRESSES = ('127.0.0.1', '::1')
+
+def admin_required(view):
+    """Restringe um endpoint administrativo ao token ADMIN_TOKEN ou, sem token, a localhost"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if ADMIN_TOKEN:
+            authorization = request.headers.get('Authorization', '')
+            if not hmac.compare_digest(authorization.encode('utf-8'), f'Bearer {ADMIN_TOKEN}'.encode('utf-8')):
+                return jsonify({'error': 'Não autorizado'}), 401
+        elif request.remote_addr not in LOCAL_ADDRESSES:
+            return jsonify({'error': 'Endpoint administrativo disponível apenas em localhost (ou defina ADMIN_TOKEN)'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+def resolve_model_path(version=None):
+    """Caminho do modelo a carregar: a versão pedida ou a ativa no registro"""
+    if model_registry is None:
+        return MODEL_PATH
+    
+    version = version or model_registry.latest_version()
+    return model_registry.serving_path(version) if version else None
+
+def load_predictor(version=None):
+    """Carrega e aquece um novo preditor e o coloca em produção atomicamente
+    
+    As requisições em andamento guardam a referência ao preditor anterior e
+    terminam com ele; as seguintes já usam o novo.
+    """
+    global predictor
+    
+    with _reload_lock:
+        model_path = resolve_model_path(version)
+        if model_path is None or not os.path.exists(model_path):
+            print(f"Modelo não encontrado: {version or model_path}")
+            return False
+        
+        new_predictor = ProjectPredictor(use_grid=MODEL_PREDICTION_GRID, grid_max_cells=MODEL_GRID_MAX_CELLS)
+        if not new_predictor.load_model(model_path, mmap_mode=MODEL_MMAP_MODE, verify=MODEL_VERIFY_CHECKSUM):
+            MODEL_LOADS_TOTAL.inc(result='error')
+            return False
+        MODEL_LOAD_DURATION.observe(new_predictor.load_duration, stage='load')
+        
+        try:
+            with MODEL_LOAD_DURATION.time(stage='warmup'):
+                new_predictor.predict(**WARMUP_PROJECT)
+        except Exception as e:
+            print(f"Erro ao aquecer modelo {new_predictor.model_version}: {e}")
+            MODEL_LOADS_TOTAL.inc(result='error')
+            return False
+        
+        predictor = new_predictor
+        MODEL_LOADS_TOTAL.inc(result='success')
+        return True
+
+def get_predictor():
+    """Retorna o preditor ativo, tentando carregá-lo se a inicialização falhou"""
+    if not predictor.is_trained:
+        load_predictor()
+    return predictor
+
+def watch_registry():
+    """Verifica periodicamente o registro e troca o modelo quando LATEST muda
+    
+    Não age enquanto uma versão estiver fixada por /admin/reload.
+    """
+    while True:
+        time.sleep(MODEL_REGISTRY_POLL_SECONDS)
+        try:
+            latest = model_registry.latest_version()
+            if pinned_version is None and latest and latest != predictor.model_version:
+                load_predictor(latest)
+        except Exception as e:
+            print(f"Erro ao verificar o registro de modelos: {e}")
+
+def start_registry_watcher():
+    if model_registry is not None and MODEL_REGISTRY_POLL_SECONDS > 0:
+        threading.Thread(target=watch_registry, name='model-registry-watcher', daemon=True).start()
+
+# Cache LRU de previsões (PREDICTION_CACHE_SIZE=0 desativa; TTL <= 0 não expira)
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', '10000'))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', '300'))
+prediction_cache = PredictionCache(
+    maxsize=PREDICTION_CACHE_SIZE,
+    ttl=PREDICTION_CACHE_TTL if PREDICTION_CACHE_TTL > 0 else None
+)
+
+# Micro-batching do /predict: requisições concorrentes são avaliadas juntas em lotes
+# de até MICRO_BATCH_MAX_SIZE linhas, esperando no máximo MICRO_BATCH_MAX_WAIT_MS
+MICRO_BATCH_MAX_SIZE = int(os.environ.get('MICRO_BATCH_MAX_SIZE', '0'))
+MICRO_BATCH_MAX_WAIT_MS = float(os.environ.get('MICRO_BATCH_MAX_WAIT_MS', '2'))
+
+def observe_micro_batch(size, wait):
+    BATCH_SIZE.observe(size, endpoint='/predict')
+    MICRO_BATCH_WAIT.observe(wait)
+
+micro_batcher = MicroBatcher(
+    max_batch_size=MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=MICRO_BATCH_MAX_WAIT_MS,
+    on_batch=observe_micro_batch
+) if MICRO_BATCH_MAX_SIZE > 1 else None
+
+# Esquema compilado de validação do /predict, montado a partir do encoder do modelo ativo
+project_schema = None
+
+def get_project_schema(current_predictor):
+    """Esquema do preditor atual; refeito só quando uma troca de modelo muda o encoder"""
+    global project_schema
+    schema = project_schema
+    if schema is None or schema.recursos_encoder is not current_predictor.recursos_encoder:
+        schema = project_schema = ProjectSchema(current_predictor.recursos_encoder)
+    return schema
+
+# Respostas compactas do /predict por padrão (sem input_data e interpretation)
+COMPACT_RESPONSES = os.environ.get('COMPACT_RESPONSES', '0').lower() in ('1', 'true', 'yes')
+
+# Base de usuários usada pelo /analyze, indexada e recarregada quando o arquivo muda
+USERS_DATA_PATH = os.environ.get('USERS_DATA_PATH', os.path.join(os.path.dirname(__file__), '..', 'data', 'usuarios.csv'))
 
-# Carregar modelo treinado
-MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'ml_model', 'project_success_model.pkl')
+def load_user_store():
+    try:
+        return UserStore(USERS_DATA_PATH)
+    except Exception as e:
+        print(f"Erro ao carregar base de usuários: {e}")
+        return None
+
+user_store = load_user_store()
+
+# Número de linhas avaliadas por chamada ao modelo no endpoint de streaming
+STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', '1000'))
+
+# Colunas de projetos.csv e o campo correspondente esperado pelo preditor
+CSV_FIELD_MAP = {
+    'Duracao_meses': 'duracao',
+    'Orcamento': 'orcamento',
+    'Tamanho_equipe': 'tamanho_equipe',
+    'Recursos_disponiveis': 'recursos'
+}
+
+# Carregar o modelo na inicialização, antes de aceitar requisições. Com o
+# servidor pré-fork (ex.: gunicorn --preload), os workers herdam o modelo já
+# carregado e compartilham as páginas dos arrays mapeados em memória.
+load_predictor()
+
+# Threads não sobrevivem ao fork: cada worker pré-fork inicia o seu observador
+start_registry_watcher()
+os.register_at_fork(after_in_child=start_registry_watcher)
+
+def metrics_endpoint():
+    """Rótulo do endpoint: a regra da rota, para não criar uma série por URL"""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+def observe_stage(stage):
+    """Mede uma etapa da requisição atual (validação, inferência ou serialização)"""
+    return STAGE_DURATION.time(endpoint=metrics_endpoint(), stage=stage)
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    g.profiler = request_profiler.start()
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = metrics_endpoint()
+    REQUESTS_TOTAL.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    start = g.request_start
+    if response.is_streamed:
+        # O corpo ainda não foi gerado: a duração vai até o servidor fechar a resposta
+        response.call_on_close(lambda: REQUEST_DURATION.observe(time.perf_counter() - start, endpoint=endpoint))
+    else:
+        REQUEST_DURATION.observe(time.perf_counter() - start, endpoint=endpoint)
+    return response
+
+@app.teardown_request
+def stop_request_profiler(exception=None):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        request_profiler.stop(profiler, metrics_endpoint())
+
+@app.route('/metrics', methods=['GET'])
+def metrics_export():
+    """Endpoint com as métricas do processo no formato de texto do Prometheus"""
+    for field, value in prediction_cache.stats().items():
+        if field in ('size', 'hits', 'misses'):
+            PREDICTION_CACHE_GAUGE.set(value, field=field)
+    
+    # O limite de concorrência é instalado por wsgi.py, fora do Flask
+    concurrency_limiter = app.extensions.get('concurrency_limiter')
+    if concurrency_limiter is not None:
+        REJECTED_REQUESTS_GAUGE.set(concurrency_limiter.stats()['rejected'])
+    
+    return Response(metrics.render(), content_type=MetricsRegistry.CONTENT_TYPE)
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -23,76 +294,86 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'message': 'API de Previsão de Sucesso de Projetos está funcionando',
-        'model_loaded': predictor.is_trained
+        'model_loaded': predictor.is_trained,
+        'model_version': predictor.model_version,
+        'prediction_cache': prediction_cache.stats(),
+        'users_loaded': user_store is not None,
+        'recommendation_cache': recommendations.cache_info(),
+        'micro_batching': micro_batcher.stats() if micro_batcher is not None else None
     })
 
+def is_compact_request():
+    """Resposta compacta pedida via ?compact=1 (ou ativada por padrão em COMPACT_RESPONSES)"""
+    compact = request.args.get('compact')
+    if compact is None:
+        return COMPACT_RESPONSES
+    return compact.lower() in ('1', 'true', 'yes')
+
+def format_prediction(prediction_result):
+    return {
+        'success': bool(prediction_result['prediction']),
+        'probability_success': prediction_result['probability_success'],
+        'probability_failure': prediction_result['probability_failure']
+    }
+
+def interpret_prediction(prediction_result):
+    """Interpretação legível de uma previsão"""
+    confidence = max(prediction_result['probability_success'], prediction_result['probability_failure'])
+    return {
+        'success_percentage': f"{prediction_result['probability_success'] * 100:.1f}%",
+        'status': 'Sucesso' if prediction_result['prediction'] else 'Fracasso',
+        'confidence': 'Alta' if confidence > 0.7 else 'Média' if confidence > 0.5 else 'Baixa'
+    }
+
 @app.route('/predict', methods=['POST'])
 def predict():
     """Endpoint para fazer previsão de sucesso de projeto"""
     try:
         # Verificar se o modelo está carregado
-        if not predictor.is_trained:
-            if not predictor.load_model(MODEL_PATH):
-                return jsonify({
-                    'error': 'Modelo não pôde ser carregado',
-                    'message': 'Certifique-se de que o modelo foi treinado primeiro'
-                }), 500
+        current_predictor = get_predictor()
+        if not current_predictor.is_trained:
+            return jsonify({
+                'error': 'Modelo não pôde ser carregado',
+                'message': 'Certifique-se de que o modelo foi treinado primeiro'
+            }), 500
         
-        # Obter dados da requisição
-        data = request.get_json()
+        # Obter e validar os dados da requisição em uma única passada
+        with observe_stage('validation'):
+            values, error = get_project_schema(current_predictor).validate(request.get_json(silent=True))
+        if error:
+            return jsonify(error), 400
         
-        # Validar dados obrigatórios
-        required_fields = ['duracao', 'orcamento', 'tamanho_equipe', 'recursos']
-        missing_fields = [field for field in required_fields if field not in data]
+        duracao, orcamento, tamanho_equipe, recursos = values
         
-        if missing_fields:
-            return jsonify({
-                'error': 'Campos obrigatórios faltando',
-                'missing_fields': missing_fields
-            }), 400
+        # Fazer previsão, consultando antes o cache
+        with observe_stage('inference'):
+            cache_key = PredictionCache.make_key(current_predictor.model_version, duracao, orcamento, tamanho_equipe, recursos)
+            prediction_result = prediction_cache.get(cache_key)
+            if prediction_result is None:
+                if micro_batcher is not None:
+                    prediction_result = micro_batcher.predict(current_predictor, (duracao, orcamento, tamanho_equipe, recursos))
+                else:
+                    prediction_result = current_predictor.predict(duracao, orcamento, tamanho_equipe, recursos)
+                prediction_cache.set(cache_key, prediction_result)
         
-        # Validar valores
-        duracao = data['duracao']
-        orcamento = data['orcamento']
-        tamanho_equipe = data['tamanho_equipe']
-        recursos = data['recursos']
-        
-        if not isinstance(duracao, (int, float)) or duracao <= 0:
-            return jsonify({'error': 'Duração deve ser um número positivo'}), 400
-        
-        if not isinstance(orcamento, (int, float)) or orcamento <= 0:
-            return jsonify({'error': 'Orçamento deve ser um número positivo'}), 400
-        
-        if not isinstance(tamanho_equipe, int) or tamanho_equipe <= 0:
-            return jsonify({'error': 'Tamanho da equipe deve ser um número inteiro positivo'}), 400
-        
-        if recursos not in ['Alto', 'Médio', 'Baixo']:
-            return jsonify({'error': 'Recursos deve ser: Alto, Médio ou Baixo'}), 400
-        
-        # Fazer previsão
-        prediction_result = predictor.predict(duracao, orcamento, tamanho_equipe, recursos)
-        
-        # Preparar resposta
-        response = {
-            'prediction': {
-                'success': bool(prediction_result['prediction']),
-                'probability_success': prediction_result['probability_success'],
-                'probability_failure': prediction_result['probability_failure']
-            },
-            'input_data': {
-                'duracao': duracao,
-                'orcamento': orcamento,
-                'tamanho_equipe': tamanho_equipe,
-                'recursos': recursos
-            },
-            'interpretation': {
-                'success_percentage': f"{prediction_result['probability_success'] * 100:.1f}%",
-                'status': 'Sucesso' if prediction_result['prediction'] else 'Fracasso',
-                'confidence': 'Alta' if max(prediction_result['probability_success'], prediction_result['probability_failure']) > 0.7 else 'Média' if max(prediction_result['probability_success'], prediction_result['probability_failure']) > 0.5 else 'Baixa'
+        with observe_stage('serialization'):
+            # Resposta compacta: apenas o bloco da previsão
+            if is_compact_request():
+                return jsonify({'prediction': format_prediction(prediction_result)})
+            
+            # Preparar resposta
+            response = {
+                'prediction': format_prediction(prediction_result),
+                'input_data': {
+                    'duracao': duracao,
+                    'orcamento': orcamento,
+                    'tamanho_equipe': tamanho_equipe,
+                    'recursos': recursos
+                },
+                'interpretation': interpret_prediction(prediction_result)
             }
-        }
-        
-        return jsonify(response)
+            
+            return jsonify(response)
         
     except Exception as e:
         return jsonify({
@@ -104,13 +385,13 @@ def predict():
 def model_info():
     """Endpoint para obter informações sobre o modelo"""
     try:
-        if not predictor.is_trained:
-            if not predictor.load_model(MODEL_PATH):
-                return jsonify({
-                    'error': 'Modelo não pôde ser carregado'
-                }), 500
+        current_predictor = get_predictor()
+        if not current_predictor.is_trained:
+            return jsonify({
+                'error': 'Modelo não pôde ser carregado'
+            }), 500
         
-        return jsonify({
+        info = {
             'model_type': 'Random Forest Classifier',
             'features': [
                 'Duração (meses)',
@@ -119,9 +400,26 @@ def model_info():
                 'Recursos disponíveis'
             ],
             'target': 'Sucesso do projeto (0/1)',
-            'resources_options': ['Alto', 'Médio', 'Baixo'],
-            'trained': predictor.is_trained
-        })
+            'resources_options': current_predictor.recursos_encoder.classes_,
+            'trained': current_predictor.is_trained,
+            'model_version': current_predictor.model_version,
+            'prediction_grid': {
+                'cells': current_predictor.grid.n_cells
+            } if current_predictor.grid is not None else None
+        }
+        
+        # Modelos carregados de um artefato trazem os metadados do manifest
+        manifest = current_predictor.manifest
+        if manifest:
+            info['artifact'] = {
+                'format_version': manifest['format_version'],
+                'content_hash': manifest['content_hash'],
+                'sklearn_version': manifest['sklearn_version'],
+                'n_estimators': manifest['n_estimators'],
+                'training_metrics': manifest['training_metrics']
+            }
+        
+        return jsonify(info)
         
     except Exception as e:
         return jsonify({
@@ -129,63 +427,356 @@ def model_info():
             'message': str(e)
         }), 500
 
+def format_batch_result(index, prediction_result):
+    """Formata o resultado de um projeto avaliado em lote"""
+    if 'error' in prediction_result:
+        return {
+            'project_index': index,
+            'error': prediction_result['error']
+        }
+    
+    return {
+        'project_index': index,
+        'success': bool(prediction_result['prediction']),
+        'probability_success': prediction_result['probability_success'],
+        'success_percentage': f"{prediction_result['probability_success'] * 100:.1f}%"
+    }
+
+def iter_chunks(items, size):
+    """Agrupa um iterável em listas de até `size` elementos"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def parse_number(value):
+    """Converte um campo de texto do CSV em número, mantendo o valor original se inválido"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return value
+
+def iter_ndjson_projects(lines):
+    """Lê projetos de linhas NDJSON (bytes), retornando (projeto, erro)
+    
+    Erros de decodificação e de JSON ficam restritos à linha em que ocorrem.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield app.json.loads(line.decode('utf-8-sig')), None
+        except ValueError as e:
+            yield None, f"JSON inválido: {e}"
+
+def iter_csv_projects(reader):
+    """Lê projetos no layout de colunas de projetos.csv, retornando (projeto, erro)"""
+    for row in reader:
+        # Linhas curtas trazem None nas colunas que faltam
+        missing_columns = [column for column in CSV_FIELD_MAP if row.get(column) is None]
+        if missing_columns:
+            yield {'id': row.get('Projeto_ID')}, f"Colunas faltando: {', '.join(missing_columns)}"
+            continue
+        
+        project = {field: row[column] for column, field in CSV_FIELD_MAP.items()}
+        for field in ['duracao', 'orcamento', 'tamanho_equipe']:
+            project[field] = parse_number(project[field])
+        project['id'] = row.get('Projeto_ID')
+        yield project, None
+
+def iter_stream_results(current_predictor, parsed_projects, chunk_size):
+    """Avalia os projetos em blocos, uma chamada vetorizada ao modelo por bloco"""
+    index = 0
+    for chunk in iter_chunks(parsed_projects, chunk_size):
+        valid = [project for project, error in chunk if error is None]
+        BATCH_SIZE.observe(len(valid), endpoint=metrics_endpoint())
+        with observe_stage('inference'):
+            batch_results = iter(current_predictor.predict_batch(valid) if valid else [])
+        
+        results = []
+        for project, error in chunk:
+            prediction_result = {'error': error} if error else next(batch_results)
+            result = format_batch_result(index, prediction_result)
+            if isinstance(project, dict) and project.get('id') is not None:
+                result['project_id'] = project['id']
+            results.append(result)
+            index += 1
+        yield results
+
+@app.route('/batch-predict/stream', methods=['POST'])
+def batch_predict_stream():
+    """Endpoint para previsões em lote via streaming (NDJSON ou CSV)"""
+    current_predictor = get_predictor()
+    if not current_predictor.is_trained:
+        return jsonify({
+            'error': 'Modelo não pôde ser carregado'
+        }), 500
+    
+    # Lê o corpo linha a linha, sem carregá-lo inteiro na memória
+    if request.mimetype == 'text/csv' or request.args.get('format') == 'csv':
+        # Bytes inválidos viram U+FFFD e a linha é recusada na validação, sem interromper o stream
+        reader = csv.DictReader(line.decode('utf-8-sig', errors='replace') for line in request.stream)
+        missing_columns = [column for column in CSV_FIELD_MAP if column not in (reader.fieldnames or [])]
+        if missing_columns:
+            return jsonify({
+                'error': 'Colunas obrigatórias faltando no CSV',
+                'missing_columns': missing_columns
+            }), 400
+        
+        def generate_csv():
+            output = io.StringIO()
+            writer = csv.writer(output)
+            writer.writerow(['project_index', 'Projeto_ID', 'success', 'probability_success', 'error'])
+            
+            for results in iter_stream_results(current_predictor, iter_csv_projects(reader), STREAM_CHUNK_SIZE):
+                for result in results:
+                    writer.writerow([
+                        result['project_index'],
+                        result.get('project_id', ''),
+                        int(result['success']) if 'success' in result else '',
+                        result.get('probability_success', ''),
+                        result.get('error', '')
+                    ])
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        
+        return Response(stream_with_context(generate_csv()), mimetype='text/csv')
+    
+    def generate_ndjson():
+        for results in iter_stream_results(current_predictor, iter_ndjson_projects(request.stream), STREAM_CHUNK_SIZE):
+            yield ''.join(app.json.dumps(result) + '\n' for result in results)
+    
+    return Response(stream_with_context(generate_ndjson()), mimetype='application/x-ndjson')
+
 @app.route('/batch-predict', methods=['POST'])
 def batch_predict():
     """Endpoint para fazer previsões em lote"""
     try:
-        if not predictor.is_trained:
-            if not predictor.load_model(MODEL_PATH):
-                return jsonify({
-                    'error': 'Modelo não pôde ser carregado'
-                }), 500
+        current_predictor = get_predictor()
+        if not current_predictor.is_trained:
+            return jsonify({
+                'error': 'Modelo não pôde ser carregado'
+            }), 500
         
-        data = request.get_json()
+        with observe_stage('validation'):
+            data = request.get_json()
         
         if 'projects' not in data or not isinstance(data['projects'], list):
             return jsonify({
                 'error': 'Formato inválido. Esperado: {"projects": [...]}'
             }), 400
         
-        results = []
-        for i, project in enumerate(data['projects']):
-            try:
-                prediction_result = predictor.predict(
-                    project['duracao'],
-                    project['orcamento'],
-                    project['tamanho_equipe'],
-                    project['recursos']
-                )
-                
-                results.append({
-                    'project_index': i,
-                    'success': bool(prediction_result['prediction']),
-                    'probability_success': prediction_result['probability_success'],
-                    'success_percentage': f"{prediction_result['probability_success'] * 100:.1f}%"
-                })
-                
-            except Exception as e:
-                results.append({
-                    'project_index': i,
-                    'error': str(e)
-                })
+        BATCH_SIZE.observe(len(data['projects']), endpoint=metrics_endpoint())
+        with observe_stage('inference'):
+            batch_results = current_predictor.predict_batch(data['projects'])
         
+        with observe_stage('serialization'):
+            results = [format_batch_result(i, prediction_result)
+                       for i, prediction_result in enumerate(batch_results)]
+            
+            return jsonify({
+                'results': results,
+                'total_projects': len(data['projects'])
+            })
+        
+    except Exception as e:
         return jsonify({
-            'results': results,
-            'total_projects': len(data['projects'])
+            'error': 'Erro no processamento em lote',
+            'message': str(e)
+        }), 500
+
+def cached_predict_batch(current_predictor, projects):
+    """Previsões em lote consultando antes o cache; só os projetos ausentes vão ao modelo"""
+    results = [None] * len(projects)
+    pending = {}
+    for i, project in enumerate(projects):
+        error = current_predictor.validate_project(project)
+        if error:
+            results[i] = {'error': error}
+            continue
+        
+        # A chave usa a classe canônica: 'medio' e 'Médio' compartilham a entrada
+        cache_key = PredictionCache.make_key(
+            current_predictor.model_version, project['duracao'], project['orcamento'], project['tamanho_equipe'],
+            current_predictor.recursos_encoder.canonical(project['recursos']))
+        results[i] = prediction_cache.get(cache_key)
+        if results[i] is None:
+            pending[i] = cache_key
+    
+    if pending:
+        BATCH_SIZE.observe(len(pending), endpoint=metrics_endpoint())
+        batch_results = current_predictor.predict_batch([projects[i] for i in pending])
+        for (i, cache_key), prediction_result in zip(pending.items(), batch_results):
+            prediction_cache.set(cache_key, prediction_result)
+            results[i] = prediction_result
+    
+    return results
+
+# Erro de usuário inexistente no /analyze, respondido com 404
+USER_NOT_FOUND_ERROR = 'Usuário não encontrado'
+
+def find_user(analysis_request):
+    """Perfil do usuário indicado por user_id ou user_name
+    
+    Retorna (perfil, erro). O nome é comparado de forma exata após a
+    normalização (acentos, maiúsculas e espaços); sem correspondência, o erro
+    traz os nomes parecidos em `suggestions`, sem juntar o projeto a outra pessoa.
+    """
+    if user_store is None:
+        return None, None
+    if analysis_request.get('user_id') is not None:
+        user = user_store.get_by_id(analysis_request['user_id'])
+        if user is None:
+            return None, {'error': USER_NOT_FOUND_ERROR, 'suggestions': []}
+        return user, None
+    if analysis_request.get('user_name'):
+        user_name = str(analysis_request['user_name'])
+        user = user_store.get(user_name)
+        if user is None:
+            return None, {
+                'error': USER_NOT_FOUND_ERROR,
+                'suggestions': [candidate['Nome'] for candidate in user_store.search_fuzzy(user_name)]
+            }
+        return user, None
+    return None, None
+
+def analyze_requests(current_predictor, analysis_requests):
+    """Junta perfil, previsão e recomendações; uma única passada pelo modelo para todos os pedidos"""
+    projects = [analysis_request.get('project') for analysis_request in analysis_requests]
+    prediction_results = cached_predict_batch(current_predictor, projects)
+    
+    results = []
+    for i, (analysis_request, project, prediction_result) in enumerate(zip(analysis_requests, projects, prediction_results)):
+        if 'error' in prediction_result:
+            results.append({'project_index': i, 'error': prediction_result['error']})
+            continue
+        
+        user, user_error = find_user(analysis_request)
+        if user_error:
+            results.append({'project_index': i, **user_error})
+            continue
+        
+        # As regras de recomendação comparam com a classe canônica ('Baixo', não 'baixo')
+        project = dict(project, recursos=current_predictor.recursos_encoder.canonical(project['recursos']))
+        results.append({
+            'project_index': i,
+            'user': user.to_dict() if user else None,
+            'prediction': format_prediction(prediction_result),
+            'input_data': {field: project[field] for field in PROJECT_FIELDS},
+            'interpretation': interpret_prediction(prediction_result),
+            'assessment': recommendations.assess(prediction_result['probability_success']),
+            'recommendations': recommendations.recommend(project, user),
+            'next_steps': list(recommendations.NEXT_STEPS)
         })
+    return results
+
+@app.route('/analyze', methods=['POST'])
+def analyze():
+    """Endpoint para previsão personalizada: perfil do usuário, previsão e recomendações"""
+    try:
+        current_predictor = get_predictor()
+        if not current_predictor.is_trained:
+            return jsonify({
+                'error': 'Modelo não pôde ser carregado'
+            }), 500
+        
+        with observe_stage('validation'):
+            data = request.get_json()
+        
+        # Um pedido {"user_id": ..., "project": {...}} ou vários em {"analyses": [...]}
+        is_batch = isinstance(data, dict) and 'analyses' in data
+        analysis_requests = data['analyses'] if is_batch else [data]
+        if not isinstance(analysis_requests, list) or not all(isinstance(item, dict) for item in analysis_requests):
+            return jsonify({
+                'error': 'Formato inválido. Esperado: {"user_id": ..., "project": {...}} ou {"analyses": [...]}'
+            }), 400
+        
+        with observe_stage('inference'):
+            results = analyze_requests(current_predictor, analysis_requests)
+        
+        with observe_stage('serialization'):
+            if is_batch:
+                return jsonify({
+                    'results': results,
+                    'total_analyses': len(results)
+                })
+            
+            result = results[0]
+            del result['project_index']
+            if 'error' in result:
+                return jsonify(result), 404 if result['error'] == USER_NOT_FOUND_ERROR else 400
+            return jsonify(result)
         
     except Exception as e:
         return jsonify({
-            'error': 'Erro no processamento em lote',
+            'error': 'Erro na análise do projeto',
             'message': str(e)
         }), 500
 
+@app.route('/admin/models', methods=['GET'])
+@admin_required
+def list_models():
+    """Endpoint para listar as versões do registro de modelos"""
+    if model_registry is None:
+        return jsonify({'error': 'Registro de modelos não configurado (MODEL_REGISTRY_DIR)'}), 404
+    
+    return jsonify({
+        'active_version': predictor.model_version,
+        'latest_version': model_registry.latest_version(),
+        'pinned_version': pinned_version,
+        'versions': [model_registry.metadata(version) for version in model_registry.versions()]
+    })
+
+@app.route('/admin/reload', methods=['POST'])
+@admin_required
+def reload_model():
+    """Endpoint para carregar uma versão em segundo plano e trocá-la sem downtime
+    
+    Uma versão explícita fica fixada (o observador do registro não a desfaz);
+    sem versão, a API volta a seguir LATEST.
+    """
+    global pinned_version
+    
+    data = request.get_json(silent=True) or {}
+    version = data.get('version')
+    
+    if version and (model_registry is None or version not in model_registry.versions()):
+        return jsonify({'error': f'Versão não encontrada no registro: {version}'}), 404
+    
+    if _reload_lock.locked():
+        return jsonify({'error': 'Já existe uma troca de modelo em andamento'}), 409
+    
+    pinned_version = version
+    threading.Thread(target=load_predictor, args=(version,), name='model-reload', daemon=True).start()
+    return jsonify({
+        'status': 'reloading',
+        'active_version': predictor.model_version,
+        'requested_version': version or 'latest'
+    }), 202
+
 if __name__ == '__main__':
     print("Iniciando API de Previsão de Sucesso de Projetos...")
     print("Endpoints disponíveis:")
     print("  GET  /health - Verificar status da API")
     print("  POST /predict - Fazer previsão individual")
     print("  POST /batch-predict - Fazer previsões em lote")
+    print("  POST /batch-predict/stream - Previsões em lote via streaming (NDJSON ou CSV)")
+    print("  POST /analyze - Previsão com perfil do usuário e recomendações")
     print("  GET  /model-info - Informações sobre o modelo")
+    print("  GET  /metrics - Métricas no formato do Prometheus")
+    print("  GET  /admin/models - Versões do registro de modelos")
+    print("  POST /admin/reload - Troca o modelo sem downtime")
+    
+    print("Servidor de desenvolvimento; em produção use: gunicorn -c gunicorn.conf.py wsgi:application")
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Debug (e o recarregamento automático) apenas com FLASK_DEBUG=1
+    app.run(host='0.0.0.0', port=5000, debug=os.environ.get('FLASK_DEBUG', '0') == '1', threaded=True)
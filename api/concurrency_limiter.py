@@ -0,0 +1,84 @@
+import json
+import threading
+
+from werkzeug.wsgi import ClosingIterator
+
+
+class ConcurrencyLimiter:
+    """Middleware WSGI que limita as requisições em andamento em cada worker
+
+    Até `max_concurrent` requisições são processadas ao mesmo tempo e até
+    `max_queue` aguardam uma vaga por no máximo `queue_timeout` segundos.
+    Acima disso a resposta é 503 imediatamente, em vez de acumular
+    requisições que já estariam atrasadas quando fossem atendidas. A vaga só
+    é liberada quando a resposta termina de ser enviada, o que também vale
+    para os endpoints de streaming.
+    """
+
+    def __init__(self, app, max_concurrent, max_queue=0, queue_timeout=1.0, exempt_paths=('/health',)):
+        self.app = app
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.exempt_paths = frozenset(exempt_paths)
+        self._slots = threading.Semaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.rejected = 0
+
+    def _acquire(self):
+        if self._slots.acquire(blocking=False):
+            return True
+
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                self.rejected += 1
+                return False
+            self._waiting += 1
+
+        try:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        if not acquired:
+            with self._lock:
+                self.rejected += 1
+        return acquired
+
+    @staticmethod
+    def _overloaded(start_response):
+        body = json.dumps({
+            'error': 'Servidor sobrecarregado',
+            'message': 'Muitas requisições em andamento. Tente novamente em instantes.'
+        }, ensure_ascii=False).encode('utf-8')
+        start_response('503 Service Unavailable', [
+            ('Content-Type', 'application/json; charset=utf-8'),
+            ('Content-Length', str(len(body))),
+            ('Retry-After', '1')
+        ])
+        return [body]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'waiting': self._waiting,
+                'rejected': self.rejected
+            }
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') in self.exempt_paths:
+            return self.app(environ, start_response)
+
+        if not self._acquire():
+            return self._overloaded(start_response)
+
+        try:
+            app_iter = self.app(environ, start_response)
+        except BaseException:
+            self._slots.release()
+            raise
+        return ClosingIterator(app_iter, [self._slots.release])
@@ -0,0 +1,50 @@
+# Configuração do gunicorn para a API em produção:
+#
+#     cd api && gunicorn -c gunicorn.conf.py wsgi:application
+#
+# Os valores podem ser ajustados por variáveis de ambiente (ver serving_config.py).
+import os
+
+from serving_config import THREADS, WORKERS
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Workers pré-fork com um pool de threads cada
+workers = WORKERS
+worker_class = 'gthread'
+threads = THREADS
+
+# Conexões aceitas por worker; além disso, as novas aguardam no backlog do socket
+worker_connections = THREADS
+backlog = int(os.environ.get('BACKLOG', '512'))
+keepalive = 5
+
+# Carrega e aquece o modelo no mestre antes do fork: os workers herdam o modelo
+# pronto e compartilham as páginas de memória dos arrays mapeados
+preload_app = True
+
+# Encerramento gracioso: com SIGTERM, os workers param de aceitar conexões e
+# têm até graceful_timeout segundos para terminar as requisições em andamento
+timeout = int(os.environ.get('WORKER_TIMEOUT', '30'))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', '30'))
+
+accesslog = os.environ.get('ACCESS_LOG')
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    """Aquece o modelo em cada worker antes que ele comece a aceitar conexões"""
+    import app as api
+
+    try:
+        api.get_predictor().predict(**api.WARMUP_PROJECT)
+    except Exception as e:
+        worker.log.error("Erro ao aquecer modelo no worker %s: %s", worker.pid, e)
+
+
+def when_ready(server):
+    server.log.info("API pronta: %s workers x %s threads", workers, threads)
+
+
+def worker_exit(server, worker):
+    server.log.info("Worker %s encerrado", worker.pid)
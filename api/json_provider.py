@@ -0,0 +1,51 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Provedor JSON do Flask que usa orjson quando está instalado
+
+    O orjson serializa direto para bytes UTF-8 e é bem mais rápido que o
+    módulo json padrão; as respostas são montadas sem a conversão
+    intermediária para str. Sem orjson, ou para objetos que ele não suporta,
+    o comportamento é o do provedor padrão do Flask.
+    """
+
+    # Chaves na ordem de inserção e texto UTF-8, como o orjson produz
+    sort_keys = False
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.dumps(obj, option=ORJSON_OPTIONS).decode('utf-8')
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        option = ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            body = orjson.dumps(obj, option=option)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,157 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Limites dos histogramas de latência, em segundos
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Limites dos histogramas de tamanho de lote
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"Métrica {self.name} espera os rótulos: {', '.join(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Contador monotônico, por combinação de rótulos"""
+
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    """Valor instantâneo, por combinação de rótulos"""
+
+    type_name = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Histograma com limites fixos, no formato cumulativo do Prometheus"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Contagens por faixa (a última é +Inf) e a soma das observações
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            # Primeira faixa com limite >= value (ou +Inf)
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observa a duração do bloco, em segundos"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self):
+        samples = []
+        for key, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                samples.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            samples.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            samples.append(f"{self.name}_count{labels} {cumulative}")
+        return samples
+
+
+class MetricsRegistry:
+    """Conjunto de métricas do processo, exportado no formato de texto do Prometheus"""
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self):
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
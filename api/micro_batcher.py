@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+
+class _PendingPrediction:
+    __slots__ = ('predictor', 'row', 'enqueued_at', 'done', 'result', 'error')
+
+    def __init__(self, predictor, row):
+        self.predictor = predictor
+        self.row = row
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Agrupa previsões individuais concorrentes em uma única chamada ao modelo
+
+    Cada requisição enfileira sua linha e aguarda. Uma thread despachante
+    forma lotes de até `max_batch_size` linhas, esperando no máximo
+    `max_wait_ms` desde a chegada da primeira, avalia o lote com um único
+    `predict_rows` e devolve o resultado de cada linha à requisição que a
+    enviou. Enquanto um lote é avaliado, as linhas seguintes já se acumulam
+    para o próximo. `on_batch(tamanho, espera_em_segundos)` é chamado a cada
+    lote, para métricas.
+    """
+
+    def __init__(self, max_batch_size=32, max_wait_ms=2.0, result_timeout=10.0, on_batch=None):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.result_timeout = result_timeout
+        self.on_batch = on_batch
+        self._pending = []
+        self._condition = threading.Condition()
+        self._worker = None
+        self._worker_pid = None
+        self.batches = 0
+        self.rows = 0
+
+    def _ensure_worker(self):
+        # Threads não sobrevivem ao fork: cada worker pré-fork inicia a sua
+        if self._worker_pid != os.getpid() or not self._worker.is_alive():
+            self._pending = []
+            self._worker_pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._worker.start()
+
+    def predict(self, predictor, row):
+        """Previsão de uma linha (duracao, orcamento, tamanho_equipe, recursos) via lote"""
+        item = _PendingPrediction(predictor, row)
+        with self._condition:
+            self._ensure_worker()
+            self._pending.append(item)
+            self._condition.notify()
+
+        if not item.done.wait(self.result_timeout):
+            raise RuntimeError("Tempo esgotado aguardando o lote de previsões")
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def _next_batch(self):
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+
+            deadline = self._pending[0].enqueued_at + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            wait = time.monotonic() - batch[0].enqueued_at
+
+            # Uma troca de modelo pode deixar linhas de preditores diferentes no mesmo lote
+            groups = {}
+            for item in batch:
+                groups.setdefault(id(item.predictor), []).append(item)
+
+            for items in groups.values():
+                try:
+                    results = items[0].predictor.predict_rows([item.row for item in items])
+                    for item, result in zip(items, results):
+                        item.result = result
+                except Exception as e:
+                    for item in items:
+                        item.error = e
+                for item in items:
+                    item.done.set()
+
+            self.batches += 1
+            self.rows += len(batch)
+            if self.on_batch is not None:
+                self.on_batch(len(batch), wait)
+
+    def stats(self):
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'rows': self.rows,
+            'mean_batch_size': self.rows / self.batches if self.batches else 0.0
+        }
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Cache LRU de previsões com expiração por tempo (TTL)
+
+    As chaves incluem a versão do modelo carregado, então um novo treinamento
+    nunca reaproveita previsões antigas: as entradas da versão anterior deixam
+    de ser consultadas e são descartadas pela política LRU.
+    """
+
+    def __init__(self, maxsize=10000, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_version, duracao, orcamento, tamanho_equipe, recursos):
+        """Chave normalizada: 8 e 8.0 meses, por exemplo, compartilham a mesma entrada"""
+        return (model_version, float(duracao), float(orcamento), int(tamanho_equipe), recursos)
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def get(self, key):
+        """Retorna a previsão em cache ou None"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if self.ttl is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Armazena uma previsão, descartando a menos usada se o cache estiver cheio"""
+        if not self.enabled:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Contadores de uso do cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
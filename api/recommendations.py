@@ -0,0 +1,110 @@
+import operator
+from functools import lru_cache
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq
+}
+
+# Regras sobre os dados do projeto: (campo, operador, limite, código, mensagem)
+PROJECT_RULES = [
+    ('duracao', '>', 12, 'duracao_longa',
+     "Duração de {duracao} meses é longa. Considere dividir em fases menores."),
+    ('duracao', '<', 3, 'duracao_curta',
+     "Duração de {duracao} meses pode ser muito curta para projetos complexos."),
+    ('orcamento', '<', 400000, 'orcamento_baixo',
+     "Orçamento de R${orcamento:,} está abaixo da média. Considere aumentar o investimento."),
+    ('orcamento', '>', 1500000, 'orcamento_alto',
+     "Orçamento alto de R${orcamento:,}. Certifique-se de que há ROI adequado."),
+    ('tamanho_equipe', '<', 5, 'equipe_pequena',
+     "Equipe pequena ({tamanho_equipe} pessoas). Considere reforçar com mais membros."),
+    ('tamanho_equipe', '>', 20, 'equipe_grande',
+     "Equipe grande ({tamanho_equipe} pessoas). Atenção à coordenação e comunicação."),
+    ('recursos', '==', 'Baixo', 'recursos_limitados',
+     "Recursos limitados podem impactar o sucesso. Considere aumentar o suporte."),
+    ('recursos', '==', 'Alto', 'recursos_abundantes',
+     "Recursos abundantes são um grande diferencial para o sucesso.")
+]
+
+# Regras sobre o perfil do usuário (colunas de usuarios.csv)
+USER_RULES = [
+    ('Sucesso_medio', '>', 80, 'historico_excelente',
+     "Seu histórico de {Sucesso_medio}% de sucesso é excelente!"),
+    ('Sucesso_medio', '<', 70, 'buscar_mentoria',
+     "Considere buscar mentoria ou treinamento para melhorar sua taxa de sucesso."),
+    ('Experiencia_anos', '>=', 5, 'experiencia_ativo',
+     "Sua experiência de {Experiencia_anos} anos é um grande ativo.")
+]
+
+# Faixas de probabilidade de sucesso, da maior para a menor
+ASSESSMENT_LEVELS = [
+    (0.8, 'alta', 'Excelente!', 'Seu projeto tem alta probabilidade de sucesso.'),
+    (0.6, 'moderada', 'Boa chance!', 'Seu projeto tem probabilidade moderada de sucesso.'),
+    (0.0, 'baixa', 'Atenção!', 'Seu projeto tem baixa probabilidade de sucesso.')
+]
+
+NEXT_STEPS = (
+    'Revisar o planejamento com base nas recomendações',
+    'Alinhar expectativas com stakeholders',
+    'Implementar controles de qualidade',
+    'Monitorar progresso regularmente'
+)
+
+RULES_CACHE_SIZE = 4096
+
+
+def _apply_rules(rules, category_of, values):
+    recommendations = []
+    for field, op, limit, code, message in rules:
+        if OPERATORS[op](values[field], limit):
+            recommendations.append({
+                'category': category_of(field),
+                'code': code,
+                'message': message.format(**values)
+            })
+    return recommendations
+
+
+@lru_cache(maxsize=RULES_CACHE_SIZE, typed=True)
+def evaluate_rules(duracao, orcamento, tamanho_equipe, recursos, sucesso_medio=None, experiencia_anos=None):
+    """Avalia as tabelas de regras; o resultado é imutável para ser reaproveitado pelo cache"""
+    project = {
+        'duracao': duracao,
+        'orcamento': orcamento,
+        'tamanho_equipe': tamanho_equipe,
+        'recursos': recursos
+    }
+    recommendations = _apply_rules(PROJECT_RULES, lambda field: field, project)
+
+    if sucesso_medio is not None:
+        user = {'Sucesso_medio': sucesso_medio, 'Experiencia_anos': experiencia_anos}
+        recommendations += _apply_rules(USER_RULES, lambda field: 'perfil', user)
+
+    return tuple(recommendations)
+
+
+def assess(probability_success):
+    """Classifica a probabilidade de sucesso na faixa correspondente"""
+    for threshold, level, title, message in ASSESSMENT_LEVELS:
+        if probability_success >= threshold:
+            return {'level': level, 'title': title, 'message': message}
+
+
+def recommend(project, user=None):
+    """Recomendações para um projeto já validado e o perfil do usuário (opcional)"""
+    return [dict(item) for item in evaluate_rules(
+        project['duracao'],
+        project['orcamento'],
+        project['tamanho_equipe'],
+        project['recursos'],
+        user['Sucesso_medio'] if user else None,
+        user['Experiencia_anos'] if user else None
+    )]
+
+
+def cache_info():
+    info = evaluate_rules.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
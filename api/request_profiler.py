@@ -0,0 +1,49 @@
+import cProfile
+import os
+import random
+import re
+import time
+
+
+class RequestProfiler:
+    """Perfilamento opcional de requisições amostradas com cProfile
+
+    Com `sample_rate` > 0, essa fração das requisições é executada sob o
+    cProfile e as estatísticas são gravadas em `output_dir`, um arquivo
+    `.prof` por requisição (abra com `python -m pstats` ou snakeviz).
+    """
+
+    def __init__(self, sample_rate=0.0, output_dir=None):
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.profiled = 0
+
+    @property
+    def enabled(self):
+        return self.sample_rate > 0 and bool(self.output_dir)
+
+    def start(self):
+        """Inicia o perfilamento se a requisição foi sorteada; retorna o profiler ou None"""
+        if not self.enabled or random.random() >= self.sample_rate:
+            return None
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Outro profiler já está ativo nesta thread
+            return None
+        return profiler
+
+    def stop(self, profiler, endpoint):
+        """Encerra o perfilamento e grava as estatísticas da requisição"""
+        profiler.disable()
+
+        name = re.sub(r'[^A-Za-z0-9]+', '_', endpoint).strip('_') or 'root'
+        filename = f"{name}-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{time.perf_counter_ns()}.prof"
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.output_dir, filename))
+            self.profiled += 1
+        except OSError as e:
+            print(f"Erro ao gravar perfil da requisição: {e}")
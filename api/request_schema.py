@@ -0,0 +1,69 @@
+from inference import NUMERIC_FIELD_RULES, parse_positive
+
+_MISSING = object()
+_INVALID = object()
+
+
+def _positive(integer):
+    """Mesma regra de ProjectPredictor.validate_project (número positivo e finito)"""
+    def parse(value):
+        parsed = parse_positive(value, integer)
+        return _INVALID if parsed is None else parsed
+
+    return parse
+
+
+def _category(encoder):
+    """Aceita as classes do CategoryEncoder do modelo e suas formas normalizadas ('medio'), devolvendo a classe"""
+    def parse(value):
+        option = encoder.canonical(value)
+        return _INVALID if option is None else option
+
+    return parse
+
+
+class ProjectSchema:
+    """Esquema compilado dos campos de um projeto
+
+    Cada campo tem uma conversão pré-montada, que devolve o valor aceito (as
+    categorias já na forma canônica) ou _INVALID, e a mensagem de erro
+    correspondente; `validate` percorre o corpo da requisição uma única vez,
+    coletando os valores, os campos faltando e o primeiro erro encontrado.
+    O campo recursos usa o CategoryEncoder do modelo carregado, o mesmo das
+    previsões em lote, então as categorias aceitas são sempre as do modelo.
+    """
+
+    NUMERIC_FIELDS = [(name, _positive(integer), message) for name, integer, message in NUMERIC_FIELD_RULES]
+
+    def __init__(self, recursos_encoder):
+        self.recursos_encoder = recursos_encoder
+        self.fields = self.NUMERIC_FIELDS + [
+            ('recursos', _category(recursos_encoder), recursos_encoder.error_message)
+        ]
+        self.field_names = [name for name, _, _ in self.fields]
+
+    def validate(self, data):
+        """Retorna (valores na ordem dos campos, None) ou (None, corpo da resposta de erro)"""
+        if type(data) is not dict:
+            return None, {'error': 'Formato inválido. Esperado um objeto com os campos: ' + ', '.join(self.field_names)}
+
+        values = []
+        missing_fields = []
+        error = None
+        for name, parse, message in self.fields:
+            value = data.get(name, _MISSING)
+            if value is _MISSING:
+                missing_fields.append(name)
+            else:
+                parsed = parse(value)
+                if parsed is _INVALID:
+                    error = error or message
+                else:
+                    value = parsed
+            values.append(value)
+
+        if missing_fields:
+            return None, {'error': 'Campos obrigatórios faltando', 'missing_fields': missing_fields}
+        if error is not None:
+            return None, {'error': error}
+        return values, None
@@ -0,0 +1,23 @@
+import os
+
+# Configuração do modo de produção, compartilhada por gunicorn.conf.py e wsgi.py
+
+# Processos workers (pré-fork); cada um tem sua própria cópia do interpretador
+WORKERS = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+
+# Tamanho máximo dos lotes do micro-batching do /predict (0 ou 1 desativa)
+MICRO_BATCH_MAX_SIZE = int(os.environ.get('MICRO_BATCH_MAX_SIZE', '0'))
+
+# Requisições processadas ao mesmo tempo por worker; com micro-batching são elas
+# que formam os lotes, então o padrão acompanha o tamanho máximo do lote
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('MAX_CONCURRENT_REQUESTS', str(max(4, MICRO_BATCH_MAX_SIZE))))
+
+# Requisições aguardando vaga em cada worker; acima disso a resposta é 503
+MAX_QUEUED_REQUESTS = int(os.environ.get('MAX_QUEUED_REQUESTS', '16'))
+
+# Espera máxima por uma vaga antes de responder 503
+QUEUE_TIMEOUT_SECONDS = float(os.environ.get('QUEUE_TIMEOUT_SECONDS', '1.0'))
+
+# Threads por worker: as que processam mais as que aguardam na fila, para que
+# o excedente chegue ao limitador e receba 503 em vez de esperar no socket
+THREADS = MAX_CONCURRENT_REQUESTS + MAX_QUEUED_REQUESTS
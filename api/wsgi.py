@@ -0,0 +1,29 @@
+"""Ponto de entrada de produção da API
+
+    cd api && gunicorn -c gunicorn.conf.py wsgi:application
+
+O modelo é carregado e aquecido na importação de `app`; com `preload_app`
+isso acontece uma única vez no processo mestre, antes do fork dos workers.
+"""
+import os
+
+from app import app
+from concurrency_limiter import ConcurrencyLimiter
+from serving_config import MAX_CONCURRENT_REQUESTS, MAX_QUEUED_REQUESTS, QUEUE_TIMEOUT_SECONDS
+
+concurrency_limiter = ConcurrencyLimiter(
+    app.wsgi_app,
+    max_concurrent=MAX_CONCURRENT_REQUESTS,
+    max_queue=MAX_QUEUED_REQUESTS,
+    queue_timeout=QUEUE_TIMEOUT_SECONDS
+)
+app.wsgi_app = concurrency_limiter
+app.extensions['concurrency_limiter'] = concurrency_limiter
+
+application = app
+
+if __name__ == '__main__':
+    # Alternativa sem gunicorn (ex.: Windows): servidor multi-thread do Werkzeug, sem debug
+    from werkzeug.serving import run_simple
+
+    run_simple('0.0.0.0', int(os.environ.get('PORT', '5000')), application, threaded=True)
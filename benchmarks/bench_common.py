@@ -0,0 +1,40 @@
+import time
+
+import numpy as np
+
+from synthetic_data import generate_projects
+
+# Colunas de projetos.csv e o campo correspondente esperado pelo preditor e pela API
+CSV_FIELD_MAP = {
+    'Duracao_meses': 'duracao',
+    'Orcamento': 'orcamento',
+    'Tamanho_equipe': 'tamanho_equipe',
+    'Recursos_disponiveis': 'recursos'
+}
+
+
+def sample_projects(n, seed):
+    """Projetos sintéticos variados no formato do corpo de /predict"""
+    data = generate_projects(n, seed=seed)[list(CSV_FIELD_MAP)].rename(columns=CSV_FIELD_MAP)
+    return [
+        {
+            'duracao': int(row.duracao),
+            'orcamento': float(row.orcamento),
+            'tamanho_equipe': int(row.tamanho_equipe),
+            'recursos': row.recursos
+        }
+        for row in data.itertuples(index=False)
+    ]
+
+
+def measure(fn, iterations, warmup):
+    """Latência de cada chamada, em milissegundos"""
+    for _ in range(warmup):
+        fn()
+
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings[i] = (time.perf_counter() - start) * 1000
+    return timings
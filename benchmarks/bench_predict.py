@@ -0,0 +1,83 @@
+import argparse
+import os
+import sys
+import warnings
+
+import numpy as np
+
+# Adicionar os diretórios da API e do modelo ao path
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(BASE_DIR, 'api'))
+sys.path.append(os.path.join(BASE_DIR, 'ml_model'))
+
+import app as api
+from inference import ProjectPredictor
+from bench_common import measure
+
+PAYLOAD = {
+    'duracao': 8,
+    'orcamento': 650000,
+    'tamanho_equipe': 12,
+    'recursos': 'Alto'
+}
+
+
+def summarize(label, timings):
+    print(f"{label:<36} média={timings.mean():7.3f} ms  "
+          f"p50={np.percentile(timings, 50):7.3f} ms  "
+          f"p99={np.percentile(timings, 99):7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark de latência do /predict')
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--model', default=api.MODEL_PATH, help='Modelo .pkl (com o estimador do scikit-learn)')
+    args = parser.parse_args()
+
+    # O modelo foi treinado com nomes de colunas; o aviso do sklearn só polui a saída
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    # A API carrega só os arrays da floresta; os modos do sklearn precisam do modelo completo
+    predictor = ProjectPredictor()
+    if not predictor.load_model(args.model) or predictor.model is None:
+        print("Erro ao carregar modelo! Informe um .pkl com o estimador do scikit-learn.")
+        return
+    api.predictor = predictor
+
+    client = api.app.test_client()
+
+    def call_predictor():
+        predictor.predict(**PAYLOAD)
+
+    def call_api():
+        # Sem o cache de previsões, cada requisição chega ao modelo
+        api.prediction_cache.clear()
+        response = client.post('/predict', json=PAYLOAD)
+        response.close()
+        assert response.status_code == 200
+
+    print(f"=== Latência por requisição ({args.iterations} iterações) ===")
+    results = {}
+    predictor.use_flat_engine = False
+    for single_pass in (False, True):
+        predictor.single_pass = single_pass
+        mode = 'passada única' if single_pass else 'duas passadas'
+        results[single_pass] = measure(call_api, args.iterations, args.warmup)
+        summarize(f"predictor.predict ({mode})", measure(call_predictor, args.iterations, args.warmup))
+        summarize(f"POST /predict ({mode})", results[single_pass])
+
+    predictor.use_flat_engine = True
+    predictor.compile_engine()
+    flat_engine_timings = measure(call_api, args.iterations, args.warmup)
+    summarize("predictor.predict (FlatForest)", measure(call_predictor, args.iterations, args.warmup))
+    summarize("POST /predict (FlatForest)", flat_engine_timings)
+
+    speedup = np.median(results[False]) / np.median(results[True])
+    print(f"\nGanho no p50 do /predict: {speedup:.2f}x")
+    speedup = np.median(results[False]) / np.median(flat_engine_timings)
+    print(f"Ganho no p50 do /predict com FlatForest: {speedup:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Adicionar os diretórios da API e do modelo ao path
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(BASE_DIR, 'api'))
+sys.path.append(os.path.join(BASE_DIR, 'ml_model'))
+
+from model import ProjectSuccessPredictor
+from inference import ProjectPredictor
+from synthetic_data import write_projects_csv
+from bench_common import measure, sample_projects
+
+DEFAULT_SIZES = [1000, 100000, 10000000]
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10000]
+STAGES = ['train', 'save_load', 'predict', 'batch', 'api']
+
+
+def peak_rss_mb():
+    """Pico de memória residente do processo atual, em MB (None se indisponível)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def latency_summary(timings_ms):
+    return {
+        'mean_ms': float(np.mean(timings_ms)),
+        'p50_ms': float(np.percentile(timings_ms, 50)),
+        'p90_ms': float(np.percentile(timings_ms, 90)),
+        'p99_ms': float(np.percentile(timings_ms, 99)),
+        'max_ms': float(np.max(timings_ms))
+    }
+
+
+def _train_in_child(data_path, model_path, n_jobs):
+    """Executado em um processo novo, para medir o pico de memória só do treino"""
+    warnings.filterwarnings('ignore')
+    baseline_mb = peak_rss_mb()
+
+    predictor = ProjectSuccessPredictor(n_jobs=n_jobs)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not predictor.train(data_path):
+            raise RuntimeError(f"Erro no treinamento com {data_path}")
+        wall_seconds = time.perf_counter() - start
+        predictor.save_model(model_path)
+
+    peak_mb = peak_rss_mb()
+    return {
+        'wall_seconds': wall_seconds,
+        'peak_rss_mb': peak_mb,
+        'peak_rss_delta_mb': peak_mb - baseline_mb if peak_mb is not None else None,
+        'n_estimators': len(predictor.model.estimators_),
+        'metrics': predictor.training_metrics
+    }
+
+
+def bench_train(data_path, model_path, n_jobs):
+    # 'spawn': processo limpo, sem as páginas herdadas do processo do benchmark
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(_train_in_child, data_path, model_path, n_jobs).result()
+
+
+def bench_save_load(model_path, tmp_dir, repeats):
+    predictor = ProjectSuccessPredictor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_model(model_path)
+
+    copy_path = os.path.join(tmp_dir, 'save_load.pkl')
+    artifact_path = os.path.join(tmp_dir, 'save_load_artifact')
+    results = {'model_size_mb': os.path.getsize(model_path) / (1024 * 1024)}
+    for label, fn in [
+        ('save_seconds', lambda: predictor.save_model(copy_path)),
+        ('load_seconds', lambda: ProjectSuccessPredictor().load_model(copy_path)),
+        ('load_mmap_seconds', lambda: ProjectSuccessPredictor().load_model(copy_path, mmap_mode='r')),
+        ('save_artifact_seconds', lambda: predictor.save_artifact(artifact_path)),
+        ('load_artifact_seconds', lambda: ProjectPredictor().load_model(artifact_path, mmap_mode='r')),
+        ('load_artifact_unverified_seconds',
+         lambda: ProjectPredictor().load_model(artifact_path, mmap_mode='r', verify=False))
+    ]:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn()
+            timings.append(time.perf_counter() - start)
+        # A primeira carga com mmap também exporta os arrays; o mínimo reflete o caso comum
+        results[label] = min(timings)
+    results['artifact_size_mb'] = sum(
+        os.path.getsize(os.path.join(artifact_path, name)) for name in os.listdir(artifact_path)
+    ) / (1024 * 1024)
+    return results
+
+
+# Motores comparados: (nome, use_flat_engine, use_grid)
+ENGINES = (('sklearn', False, False), ('flat_forest', True, False), ('grid', True, True))
+
+
+def load_predictor(model_path, use_flat_engine, use_grid=False):
+    predictor = ProjectSuccessPredictor(use_flat_engine=use_flat_engine, use_grid=use_grid)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not predictor.load_model(model_path):
+            raise RuntimeError(f"Erro ao carregar modelo: {model_path}")
+    return predictor
+
+
+def iter_engines(model_path):
+    """Preditores de cada motor; a tabela é omitida quando excede o limite de células"""
+    for engine, use_flat_engine, use_grid in ENGINES:
+        predictor = load_predictor(model_path, use_flat_engine, use_grid)
+        if use_grid and predictor.grid is None:
+            continue
+        yield engine, predictor
+
+
+def bench_predict(model_path, projects, iterations, warmup):
+    results = {}
+    for engine, predictor in iter_engines(model_path):
+        cursor = iter(np.arange(iterations + warmup) % len(projects))
+        results[engine] = latency_summary(measure(
+            lambda: predictor.predict(**projects[next(cursor)]), iterations, warmup))
+    return results
+
+
+def bench_batch(model_path, projects, batch_sizes, min_seconds):
+    results = {}
+    for engine, predictor in iter_engines(model_path):
+        engine_results = {}
+        for batch_size in batch_sizes:
+            batch = (projects * (batch_size // len(projects) + 1))[:batch_size]
+            predictor.predict_batch(batch)
+
+            calls = 0
+            start = time.perf_counter()
+            while True:
+                predictor.predict_batch(batch)
+                calls += 1
+                elapsed = time.perf_counter() - start
+                if elapsed >= min_seconds:
+                    break
+            engine_results[str(batch_size)] = {
+                'rows_per_second': calls * batch_size / elapsed,
+                'ms_per_batch': elapsed / calls * 1000
+            }
+        results[engine] = engine_results
+    return results
+
+
+def bench_api(model_path, projects, iterations, warmup):
+    """RPS do /predict pelo cliente de teste do Flask, com o modelo do tamanho avaliado"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as api
+
+    # Mesma configuração da API em produção: floresta em arrays mapeados em memória
+    predictor = ProjectSuccessPredictor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not predictor.load_model(model_path, mmap_mode=api.MODEL_MMAP_MODE):
+            raise RuntimeError(f"Erro ao carregar modelo: {model_path}")
+    api.predictor = predictor
+    api.prediction_cache.clear()
+
+    client = api.app.test_client()
+    cursor = iter(np.arange(iterations + warmup) % len(projects))
+
+    def call_api():
+        response = client.post('/predict?compact=1', json=projects[next(cursor)])
+        response.close()
+        if response.status_code != 200:
+            raise RuntimeError(f"/predict retornou {response.status_code}")
+
+    timings = measure(call_api, iterations, warmup)
+    summary = latency_summary(timings)
+    summary['requests_per_second'] = iterations / (timings.sum() / 1000)
+    summary['prediction_cache'] = api.prediction_cache.stats()
+    return summary
+
+
+# Métricas comparadas com a execução de referência: (caminho no JSON, maior é melhor)
+KEY_METRICS = [
+    (('train', 'wall_seconds'), False),
+    (('train', 'peak_rss_mb'), False),
+    (('save_load', 'load_seconds'), False),
+    (('save_load', 'load_artifact_seconds'), False),
+    (('predict', 'flat_forest', 'p50_ms'), False),
+    (('predict', 'sklearn', 'p50_ms'), False),
+    (('api', 'requests_per_second'), True)
+]
+
+
+def compare(results, baseline, tolerance):
+    """Lista as métricas que pioraram mais que `tolerance` em relação à referência"""
+    regressions = []
+    for n_rows, size_results in results['datasets'].items():
+        baseline_size = baseline.get('datasets', {}).get(n_rows)
+        if baseline_size is None:
+            continue
+        for path, higher_is_better in KEY_METRICS:
+            current, previous = size_results, baseline_size
+            for key in path:
+                current = current.get(key) if isinstance(current, dict) else None
+                previous = previous.get(key) if isinstance(previous, dict) else None
+            if not current or not previous:
+                continue
+
+            change = current / previous - 1
+            worse = -change if higher_is_better else change
+            print(f"{n_rows:>10} {'.'.join(path):<30} {previous:12.4f} -> {current:12.4f} ({change:+.1%})")
+            if worse > tolerance:
+                regressions.append((n_rows, '.'.join(path), change))
+    return regressions
+
+
+def environment_info():
+    import sklearn
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'scikit_learn': sklearn.__version__
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Suíte de benchmarks: treino, previsão, lote e API')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Linhas dos datasets sintéticos')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=DEFAULT_BATCH_SIZES)
+    parser.add_argument('--iterations', type=int, default=1000, help='Chamadas medidas no predict e no /predict')
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--min-seconds', type=float, default=1.0, help='Tempo mínimo por tamanho de lote')
+    parser.add_argument('--save-load-repeats', type=int, default=3)
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Núcleos usados no treinamento')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmark_results.json', help='Arquivo JSON com os resultados')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior para comparação')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Piora relativa tolerada na comparação')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    results = {
+        'environment': environment_info(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'baseline', 'tolerance')},
+        'datasets': {}
+    }
+
+    # Projetos de consulta fixos, independentes do dataset de treino
+    projects = sample_projects(10000, seed=args.seed + 1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in args.sizes:
+            print(f"\n=== Dataset sintético com {n_rows} linhas (seed={args.seed}) ===")
+            size_results = {}
+            data_path = os.path.join(tmp_dir, f'projetos_{n_rows}.csv')
+            model_path = os.path.join(tmp_dir, f'model_{n_rows}.pkl')
+
+            start = time.perf_counter()
+            write_projects_csv(data_path, n_rows, seed=args.seed)
+            size_results['generate_seconds'] = time.perf_counter() - start
+
+            # As demais etapas usam o modelo treinado neste dataset
+            train = bench_train(data_path, model_path, args.n_jobs)
+            os.remove(data_path)
+            if 'train' in args.stages:
+                size_results['train'] = train
+                peak = f"{train['peak_rss_mb']:.0f} MB" if train['peak_rss_mb'] is not None else 'indisponível'
+                print(f"Treino: {train['wall_seconds']:.2f}s, pico de memória {peak}")
+
+            if 'save_load' in args.stages:
+                size_results['save_load'] = bench_save_load(model_path, tmp_dir, args.save_load_repeats)
+                save_load = size_results['save_load']
+                print(f"Modelo de {save_load['model_size_mb']:.1f} MB: salvar {save_load['save_seconds']:.3f}s  "
+                      f"carregar {save_load['load_seconds']:.3f}s  carregar com mmap {save_load['load_mmap_seconds']:.3f}s")
+                print(f"Artefato de {save_load['artifact_size_mb']:.1f} MB: salvar {save_load['save_artifact_seconds']:.3f}s  "
+                      f"carregar {save_load['load_artifact_seconds']:.3f}s  "
+                      f"sem checksum {save_load['load_artifact_unverified_seconds']:.3f}s")
+
+            if 'predict' in args.stages:
+                size_results['predict'] = bench_predict(model_path, projects, args.iterations, args.warmup)
+                for engine, summary in size_results['predict'].items():
+                    print(f"predict() [{engine}]: p50={summary['p50_ms']:.3f} ms  p99={summary['p99_ms']:.3f} ms")
+
+            if 'batch' in args.stages:
+                size_results['batch'] = bench_batch(model_path, projects, args.batch_sizes, args.min_seconds)
+                for engine, by_size in size_results['batch'].items():
+                    throughput = '  '.join(f"{size}: {value['rows_per_second']:,.0f}/s" for size, value in by_size.items())
+                    print(f"predict_batch() [{engine}]: {throughput}")
+
+            if 'api' in args.stages:
+                size_results['api'] = bench_api(model_path, projects, args.iterations, args.warmup)
+                print(f"/predict: {size_results['api']['requests_per_second']:.0f} req/s  "
+                      f"p50={size_results['api']['p50_ms']:.3f} ms")
+
+            results['datasets'][str(n_rows)] = size_results
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResultados salvos em: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n=== Comparação com {args.baseline} ===")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressões acima de {args.tolerance:.0%}:")
+            for n_rows, metric, change in regressions:
+                print(f"  - {n_rows} linhas, {metric}: {change:+.1%}")
+            sys.exit(1)
+        print("\nNenhuma regressão acima da tolerância.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Adicionar o diretório do modelo ao path
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(BASE_DIR, 'ml_model'))
+
+from model import ProjectSuccessPredictor
+from synthetic_data import write_projects_csv
+
+
+def run_training(data_path, n_jobs, search):
+    """Treina um preditor e retorna as métricas, sem a saída detalhada do treino"""
+    predictor = ProjectSuccessPredictor(n_jobs=n_jobs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not predictor.train(data_path, search=search):
+            raise RuntimeError(f"Erro no treinamento com {data_path}")
+    return predictor.training_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de treinamento sequencial vs paralelo')
+    parser.add_argument('--rows', type=int, default=100000, help='Linhas do dataset sintético')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--search', action='store_true', help='Inclui a busca de hiperparâmetros')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = write_projects_csv(os.path.join(tmp_dir, 'projetos.csv'), args.rows, seed=args.seed)
+
+        print(f"=== Treinamento com {args.rows} projetos sintéticos (seed={args.seed}) ===")
+        results = {}
+        for n_jobs in (1, -1):
+            metrics = run_training(data_path, n_jobs, args.search)
+            results[n_jobs] = metrics
+            print(f"n_jobs={n_jobs:>2}: {metrics['training_time_seconds']:.2f}s  "
+                  f"acurácia={metrics['accuracy']:.4f}  f1={metrics['f1']:.4f}")
+
+    speedup = results[1]['training_time_seconds'] / results[-1]['training_time_seconds']
+    print(f"\nGanho com todos os núcleos ({os.cpu_count()} CPUs): {speedup:.2f}x")
+    print(json.dumps({str(n_jobs): metrics for n_jobs, metrics in results.items()}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
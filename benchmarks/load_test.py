@@ -0,0 +1,136 @@
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from bench_common import sample_projects
+
+
+class LoadWorker(threading.Thread):
+    """Cliente em loop fechado: envia uma requisição, espera a resposta e repete"""
+
+    def __init__(self, url, make_body, deadline, timeout):
+        super().__init__(daemon=True)
+        self.url = url
+        self.make_body = make_body
+        self.deadline = deadline
+        self.timeout = timeout
+        self.latencies = []
+        self.status_counts = {}
+        self.errors = 0
+
+    def run(self):
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        i = 0
+        while time.monotonic() < self.deadline:
+            body = self.make_body(i)
+            i += 1
+            start = time.perf_counter()
+            try:
+                response = session.post(self.url, json=body, timeout=self.timeout)
+                status = response.status_code
+            except requests.RequestException:
+                self.errors += 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            if status == 200:
+                self.latencies.append(elapsed)
+        session.close()
+
+
+def run_load(url, make_body, concurrency, duration, timeout):
+    deadline = time.monotonic() + duration
+    workers = [LoadWorker(url, make_body, deadline, timeout) for _ in range(concurrency)]
+
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([latency for worker in workers for latency in worker.latencies])
+    status_counts = {}
+    for worker in workers:
+        for status, count in worker.status_counts.items():
+            status_counts[str(status)] = status_counts.get(str(status), 0) + count
+
+    result = {
+        'concurrency': concurrency,
+        'duration_seconds': round(elapsed, 3),
+        'requests_ok': int(latencies.size),
+        'throughput_rps': latencies.size / elapsed,
+        'status_counts': status_counts,
+        'connection_errors': sum(worker.errors for worker in workers)
+    }
+    if latencies.size:
+        result['latency_ms'] = {
+            'mean': float(latencies.mean()),
+            'p50': float(np.percentile(latencies, 50)),
+            'p90': float(np.percentile(latencies, 90)),
+            'p99': float(np.percentile(latencies, 99)),
+            'max': float(latencies.max())
+        }
+    return result
+
+
+def print_result(label, result):
+    print(f"\n=== {label} (concorrência {result['concurrency']}, {result['duration_seconds']:.1f}s) ===")
+    print(f"Vazão: {result['throughput_rps']:.1f} req/s ({result['requests_ok']} respostas 200)")
+    if 'latency_ms' in result:
+        latency = result['latency_ms']
+        print(f"Latência: média={latency['mean']:.2f} ms  p50={latency['p50']:.2f} ms  "
+              f"p90={latency['p90']:.2f} ms  p99={latency['p99']:.2f} ms  max={latency['max']:.2f} ms")
+    print(f"Status: {result['status_counts']}  erros de conexão: {result['connection_errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga do /predict e do /batch-predict')
+    parser.add_argument('--url', default='http://localhost:5000', help='URL base da API')
+    parser.add_argument('--endpoints', nargs='+', choices=['predict', 'batch-predict'],
+                        default=['predict', 'batch-predict'])
+    parser.add_argument('--concurrency', type=int, default=32, help='Clientes simultâneos')
+    parser.add_argument('--duration', type=float, default=10, help='Segundos por endpoint')
+    parser.add_argument('--batch-size', type=int, default=100, help='Projetos por chamada ao /batch-predict')
+    parser.add_argument('--projects', type=int, default=10000, help='Projetos sintéticos distintos')
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Arquivo JSON com os resultados')
+    args = parser.parse_args()
+
+    url = args.url.rstrip('/')
+    requests.get(f"{url}/health", timeout=args.timeout).raise_for_status()
+
+    payloads = sample_projects(args.projects, args.seed)
+
+    def predict_body(i):
+        return payloads[i % len(payloads)]
+
+    def batch_body(i):
+        start = (i * args.batch_size) % len(payloads)
+        return {'projects': payloads[start:start + args.batch_size] or payloads[:args.batch_size]}
+
+    bodies = {'predict': predict_body, 'batch-predict': batch_body}
+    results = {}
+    for endpoint in args.endpoints:
+        result = run_load(f"{url}/{endpoint}", bodies[endpoint], args.concurrency, args.duration, args.timeout)
+        if endpoint == 'batch-predict':
+            result['batch_size'] = args.batch_size
+            result['projects_per_second'] = result['throughput_rps'] * args.batch_size
+        results[endpoint] = result
+        print_result(f"/{endpoint}", result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultados salvos em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Módulo importado por cada alvo e o diretório de onde é importado
+TARGETS = {
+    'api': ('api', 'app'),
+    'inference': ('ml_model', 'inference'),
+    'training': ('ml_model', 'model'),
+    'chatbot': ('chatbot', 'chatbot'),
+    'chat_server': ('chatbot', 'server')
+}
+
+# Dependências de treinamento que os processos de serviço não devem carregar
+TRAINING_ONLY_MODULES = ['pandas', 'scipy', 'sklearn', 'sklearn.model_selection', 'sklearn.metrics']
+SERVING_TARGETS = {'api', 'inference', 'chatbot', 'chat_server'}
+
+
+def parse_importtime(stderr):
+    """Lê a saída de -X importtime: {módulo: (próprio, cumulativo)} em microssegundos"""
+    modules = {}
+    top_level_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Módulos de primeiro nível não têm indentação no nome
+        if not name.startswith('  '):
+            top_level_us += int(cumulative_us)
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules, top_level_us
+
+
+def run_target(target):
+    directory, module = TARGETS[target]
+    cwd = os.path.join(ROOT, directory)
+    env = dict(os.environ, PYTHONPATH=cwd)
+
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {module}:\n{completed.stderr[-2000:]}")
+
+    modules, top_level_us = parse_importtime(completed.stderr)
+    return wall, modules, top_level_us
+
+
+def bench_target(target, repeats, top):
+    # A primeira execução aquece o cache de bytecode e exporta o motor do modelo
+    run_target(target)
+
+    walls, import_times = [], []
+    for _ in range(repeats):
+        wall, modules, top_level_us = run_target(target)
+        walls.append(wall)
+        import_times.append(top_level_us / 1e6)
+
+    slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+    return {
+        'wall_seconds': min(walls),
+        'import_seconds': min(import_times),
+        'modules_loaded': len(modules),
+        'training_modules_loaded': [name for name in TRAINING_ONLY_MODULES if name in modules],
+        'slowest_imports': [
+            {'module': name, 'cumulative_ms': cumulative / 1000, 'self_ms': own / 1000}
+            for name, (own, cumulative) in slowest[:top]
+        ]
+    }
+
+
+def print_result(target, result):
+    print(f"\n=== {target} ===")
+    print(f"Processo completo: {result['wall_seconds'] * 1000:.0f} ms  "
+          f"importações: {result['import_seconds'] * 1000:.0f} ms  módulos: {result['modules_loaded']}")
+    loaded = result['training_modules_loaded']
+    print(f"Dependências de treinamento carregadas: {', '.join(loaded) if loaded else 'nenhuma'}")
+    for entry in result['slowest_imports']:
+        print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo de inicialização medido com python -X importtime')
+    parser.add_argument('--targets', nargs='+', choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument('--repeats', type=int, default=5, help='Execuções por alvo (usa o mínimo)')
+    parser.add_argument('--top', type=int, default=10, help='Importações mais lentas exibidas')
+    parser.add_argument('--output', help='Arquivo JSON com os resultados')
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    for target in args.targets:
+        result = bench_target(target, args.repeats, args.top)
+        results[target] = result
+        print_result(target, result)
+        if target in SERVING_TARGETS and result['training_modules_loaded']:
+            print(f"Aviso: {target} carregou dependências de treinamento")
+            failed = True
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultados salvos em: {args.output}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
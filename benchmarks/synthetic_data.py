@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+RECURSOS_OPTIONS = np.array(['Alto', 'Médio', 'Baixo'])
+
+
+def generate_projects(n_rows, seed=42):
+    """Gera projetos sintéticos no layout de data/projetos.csv
+
+    O sucesso segue uma regra logística sobre as features (mais recursos e
+    orçamento por pessoa ajudam; projetos longos atrapalham), com ruído, para
+    que o modelo tenha algo a aprender.
+    """
+    rng = np.random.default_rng(seed)
+
+    duracao = rng.integers(1, 31, n_rows, dtype=np.int16)
+    tamanho_equipe = rng.integers(3, 31, n_rows, dtype=np.int16)
+    orcamento = (rng.lognormal(mean=13.6, sigma=0.6, size=n_rows) // 10000 * 10000).astype(np.float32)
+    recursos_idx = rng.integers(0, 3, n_rows)
+
+    score = (
+        1.2 * (recursos_idx == 0) - 1.0 * (recursos_idx == 2)
+        + 0.8 * np.log(orcamento / (tamanho_equipe * 60000.0))
+        - 0.08 * duracao
+        + rng.normal(0, 0.7, n_rows)
+    )
+
+    return pd.DataFrame({
+        'Projeto_ID': np.arange(1, n_rows + 1, dtype=np.int64),
+        'Duracao_meses': duracao,
+        'Orcamento': orcamento,
+        'Tamanho_equipe': tamanho_equipe,
+        'Recursos_disponiveis': RECURSOS_OPTIONS[recursos_idx],
+        'Sucesso': (score > 0).astype(np.int8)
+    })
+
+
+def write_projects_csv(path, n_rows, seed=42, chunk_rows=1000000):
+    """Grava um CSV sintético em blocos, sem manter todas as linhas na memória"""
+    for start in range(0, n_rows, chunk_rows):
+        chunk = generate_projects(min(chunk_rows, n_rows - start), seed=seed + start)
+        chunk['Projeto_ID'] += start
+        chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+    return path
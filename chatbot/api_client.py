@@ -0,0 +1,302 @@
+import asyncio
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class CircuitOpenError(Exception):
+    """A API falhou repetidamente e as chamadas estão suspensas temporariamente"""
+
+
+class UserNotFoundError(ValueError):
+    """O /analyze não encontrou o usuário; `suggestions` traz os nomes parecidos"""
+
+    def __init__(self, message, suggestions=()):
+        super().__init__(message)
+        self.suggestions = list(suggestions)
+
+
+class CircuitBreaker:
+    """Disjuntor para chamadas à API
+
+    Após `failure_threshold` falhas consecutivas o circuito abre e as chamadas
+    falham imediatamente por `reset_timeout` segundos. Depois disso, uma
+    chamada de teste é liberada: se funcionar o circuito fecha, senão reabre.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
+
+    def allow(self):
+        """Indica se uma chamada pode ser feita agora"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_progress:
+                return False
+            self._trial_in_progress = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_progress or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_progress = False
+
+
+def analysis_request(project, user_id=None, user_name=None):
+    """Corpo de um pedido ao /analyze; o perfil é buscado pela API"""
+    request = {'project': project}
+    if user_id is not None:
+        request['user_id'] = user_id
+    elif user_name:
+        request['user_name'] = user_name
+    return request
+
+
+class PredictionClient:
+    """Cliente HTTP da API de previsão, compartilhável entre sessões do chatbot
+
+    Usa uma única `requests.Session` com pool de conexões keep-alive, novas
+    tentativas com backoff exponencial para erros de conexão e respostas
+    502/503/504, e um disjuntor para não sobrecarregar uma API indisponível.
+    """
+
+    def __init__(self, api_url="http://localhost:5000", timeout=(3.05, 10), max_retries=3,
+                 backoff_factor=0.2, pool_maxsize=50, circuit_breaker=None):
+        self.api_url = api_url.rstrip('/')
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=['GET', 'POST'],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _request(self, method, path, timeout=None, **kwargs):
+        """Faz a chamada respeitando o disjuntor"""
+        if not self.circuit_breaker.allow():
+            raise CircuitOpenError("API de previsão temporariamente indisponível")
+
+        try:
+            response = self.session.request(method, f"{self.api_url}{path}", timeout=timeout or self.timeout, **kwargs)
+        except requests.RequestException:
+            self.circuit_breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        response.raise_for_status()
+        return response.json()
+
+    def health(self):
+        """Verifica se a API está funcionando"""
+        try:
+            self._request('GET', '/health', timeout=5)
+            return True
+        except (requests.RequestException, CircuitOpenError, ValueError):
+            return False
+
+    def predict(self, project):
+        """Previsão individual via /predict
+
+        Retorna a resposta completa do /predict: {'prediction': {'success',
+        'probability_success', 'probability_failure'}, 'input_data', 'interpretation'}.
+        """
+        return self._request('POST', '/predict', json=project)
+
+    def batch_predict(self, projects):
+        """Previsões em lote via /batch-predict, na ordem de `projects`"""
+        return self._request('POST', '/batch-predict', json={'projects': projects})['results']
+
+    def analyze(self, project, user_id=None, user_name=None):
+        """Previsão personalizada via /analyze: perfil do usuário, previsão e recomendações
+
+        Lança UserNotFoundError se o usuário indicado não existir na base da API.
+        """
+        try:
+            return self._request('POST', '/analyze', json=analysis_request(project, user_id, user_name))
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            body = e.response.json()
+            raise UserNotFoundError(body.get('error', 'Usuário não encontrado'), body.get('suggestions', [])) from e
+
+    def batch_analyze(self, analysis_requests):
+        """Várias análises em uma só chamada ao /analyze, na ordem de `analysis_requests`"""
+        return self._request('POST', '/analyze', json={'analyses': analysis_requests})['results']
+
+    def close(self):
+        self.session.close()
+
+
+
+class AsyncPredictionClient:
+    """Variante asyncio que agrupa chamadas concorrentes em requisições em lote
+
+    Cada `await predict(...)` (ou `await analyze(...)`) entra na fila do seu
+    endpoint; um agrupador por fila junta até `max_batch_size` pedidos ou
+    espera no máximo `max_wait_ms` e envia o lote em uma só requisição
+    (/batch-predict ou /analyze) pelo cliente com pool de conexões.
+    """
+
+    # Fila -> método do cliente que envia o lote
+    BATCH_METHODS = {'predict': 'batch_predict', 'analyze': 'batch_analyze'}
+
+    def __init__(self, client=None, max_batch_size=32, max_wait_ms=10, max_concurrent_batches=4):
+        self.client = client or PredictionClient()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_concurrent_batches = max_concurrent_batches
+        self._queues = {}
+        self._flushers = {}
+        self._in_flight = None
+        self._tasks = set()
+        # Futures ainda sem resposta, falhados por close()
+        self._pending = set()
+        # Filas, agrupadores e semáforo pertencem ao loop em que foram criados
+        self._loop = None
+
+    def _ensure_flusher(self, kind):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Outro loop (ex.: uma nova chamada a asyncio.run): recria o estado nele
+            self._loop = loop
+            self._queues = {}
+            self._flushers = {}
+            self._tasks = set()
+            self._pending = set()
+            # Lotes de todas as filas compartilham o limite de requisições simultâneas
+            self._in_flight = asyncio.Semaphore(self.max_concurrent_batches)
+
+        flusher = self._flushers.get(kind)
+        if flusher is None or flusher.done():
+            self._queues[kind] = asyncio.Queue()
+            self._flushers[kind] = loop.create_task(self._flush_loop(kind))
+        return self._queues[kind]
+
+    async def _collect_batch(self, queue):
+        """Aguarda o primeiro pedido e junta os que chegarem dentro da janela"""
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush_loop(self, kind):
+        loop = asyncio.get_running_loop()
+        queue = self._queues[kind]
+        # Semáforo do loop atual; cada lote libera o mesmo que adquiriu, mesmo
+        # que close() ou uma troca de loop substitua self._in_flight
+        in_flight = self._in_flight
+        while True:
+            batch = await self._collect_batch(queue)
+            # Até max_concurrent_batches lotes em andamento ao mesmo tempo
+            await in_flight.acquire()
+            task = loop.create_task(self._send_batch(kind, batch, in_flight))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, kind, batch, in_flight):
+        payloads = [payload for payload, _ in batch]
+        send = getattr(self.client, self.BATCH_METHODS[kind])
+        try:
+            results = await asyncio.to_thread(send, payloads)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            in_flight.release()
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if 'suggestions' in result:
+                future.set_exception(UserNotFoundError(result['error'], result['suggestions']))
+            elif 'error' in result:
+                future.set_exception(ValueError(result['error']))
+            else:
+                # O índice se refere ao lote agrupado, não ao chamador
+                result.pop('project_index', None)
+                future.set_result(result)
+
+    async def _submit(self, kind, payload):
+        queue = self._ensure_flusher(kind)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        await queue.put((payload, future))
+        return await future
+
+    async def predict(self, project):
+        """Previsão de um projeto, agrupada com as demais pendentes
+
+        Como as previsões vão em lote ao /batch-predict, o retorno é a linha do
+        lote sem o project_index ({'success', 'probability_success',
+        'success_percentage'}), e não a resposta completa de PredictionClient.predict.
+        """
+        return await self._submit('predict', project)
+
+    async def analyze(self, project, user_id=None, user_name=None):
+        """Análise personalizada via /analyze, agrupada com as demais pendentes"""
+        return await self._submit('analyze', analysis_request(project, user_id, user_name))
+
+    async def health(self):
+        return await asyncio.to_thread(self.client.health)
+
+    async def close(self):
+        """Cancela agrupadores e lotes em andamento; chamadas pendentes falham com RuntimeError"""
+        for task in [*self._flushers.values(), *self._tasks]:
+            task.cancel()
+        for future in list(self._pending):
+            if not future.done():
+                future.set_exception(RuntimeError('Cliente encerrado antes da resposta'))
+        self._flushers = {}
+        self._queues = {}
+        self._tasks = set()
+        self._pending = set()
+        self._in_flight = None
+        self._loop = None
+        await asyncio.to_thread(self.client.close)
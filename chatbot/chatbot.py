@@ -1,13 +1,18 @@
 import requests
-import pandas as pd
 import json
 import sys
 import os
 
+from api_client import CircuitOpenError, PredictionClient
+from conversation import render_analysis
+from user_store import UserStore
+
 class ProjectSuccessChatbot:
-    def __init__(self, api_url="http://localhost:5000", users_data_path="../data/usuarios.csv"):
+    def __init__(self, api_url="http://localhost:5000", users_data_path="../data/usuarios.csv", client=None):
         self.api_url = api_url
         self.users_data_path = users_data_path
+        # Cliente com pool de conexões; pode ser compartilhado entre várias sessões
+        self.client = client or PredictionClient(api_url)
         self.current_user = None
         self.project_data = {}
         self.conversation_state = "start"
@@ -18,32 +23,46 @@ class ProjectSuccessChatbot:
     def load_users_data(self):
         """Carrega a base de dados de usuários"""
         try:
-            self.users_df = pd.read_csv(self.users_data_path)
+            self.users = UserStore(self.users_data_path)
             print("Base de dados de usuários carregada com sucesso!")
         except Exception as e:
             print(f"Erro ao carregar base de usuários: {e}")
-            self.users_df = pd.DataFrame()
+            self.users = None
     
     def get_user_by_name(self, name):
-        """Busca usuário por nome"""
-        if self.users_df.empty:
+        """Busca exata do usuário por nome (sem diferenciar acentos, maiúsculas e espaços)"""
+        if self.users is None:
+            return None
+        
+        return self.users.get(name)
+    
+    def suggest_user(self, name):
+        """Usuário de nome mais parecido, para confirmação, ou None"""
+        if self.users is None:
+            return None
+        
+        matches = self.users.search_fuzzy(name, limit=1)
+        return matches[0] if matches else None
+    
+    def identify_user(self, user_name):
+        """Identifica o usuário pelo nome; um nome apenas parecido só é aceito após confirmação"""
+        user = self.get_user_by_name(user_name)
+        if user is not None:
+            return user
+        
+        candidate = self.suggest_user(user_name)
+        if candidate is None:
             return None
         
-        user_row = self.users_df[self.users_df['Nome'].str.lower() == name.lower()]
-        if not user_row.empty:
-            return user_row.iloc[0].to_dict()
-        return None
+        resposta = input(f"Você quis dizer '{candidate['Nome']}'? (s/n): ")
+        return candidate if resposta.strip().lower() in ['s', 'sim', 'y', 'yes'] else None
     
     def check_api_status(self):
         """Verifica se a API está funcionando"""
-        try:
-            response = requests.get(f"{self.api_url}/health", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        return self.client.health()
     
     def get_prediction(self, duracao, orcamento, tamanho_equipe, recursos):
-        """Faz chamada para a API de previsão"""
+        """Faz chamada para a API de análise (previsão, perfil e recomendações)"""
         try:
             data = {
                 "duracao": duracao,
@@ -52,12 +71,9 @@ class ProjectSuccessChatbot:
                 "recursos": recursos
             }
             
-            response = requests.post(f"{self.api_url}/predict", json=data, timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return None
-        except Exception as e:
+            user_id = self.current_user['Usuario_ID'] if self.current_user else None
+            return self.client.analyze(data, user_id=user_id)
+        except (requests.RequestException, CircuitOpenError, ValueError) as e:
             print(f"Erro ao fazer previsão: {e}")
             return None
     
@@ -66,82 +82,7 @@ class ProjectSuccessChatbot:
         if not prediction_result:
             return "Desculpe, não foi possível fazer a previsão no momento. Tente novamente mais tarde."
         
-        success_prob = prediction_result['prediction']['probability_success']
-        success_percentage = prediction_result['interpretation']['success_percentage']
-        
-        # Resposta base
-        response = f"🎯 **Análise do Projeto**\n\n"
-        
-        # Informações do usuário
-        if self.current_user:
-            user_success = self.current_user['Sucesso_medio']
-            user_exp = self.current_user['Experiencia_anos']
-            user_cargo = self.current_user['Cargo']
-            
-            response += f"📊 **Perfil do Usuário:** {self.current_user['Nome']} ({user_cargo})\n"
-            response += f"   - Experiência: {user_exp} anos\n"
-            response += f"   - Taxa de sucesso histórica: {user_success}%\n\n"
-        
-        # Resultado da previsão
-        response += f"📈 **Previsão do Modelo:** {success_percentage} de chance de sucesso\n\n"
-        
-        # Análise personalizada
-        if success_prob >= 0.8:
-            response += "✅ **Excelente!** Seu projeto tem alta probabilidade de sucesso.\n"
-        elif success_prob >= 0.6:
-            response += "⚠️ **Boa chance!** Seu projeto tem probabilidade moderada de sucesso.\n"
-        else:
-            response += "🔴 **Atenção!** Seu projeto tem baixa probabilidade de sucesso.\n"
-        
-        # Recomendações baseadas nos dados
-        response += "\n💡 **Recomendações:**\n"
-        
-        duracao = self.project_data['duracao']
-        orcamento = self.project_data['orcamento']
-        tamanho_equipe = self.project_data['tamanho_equipe']
-        recursos = self.project_data['recursos']
-        
-        # Análise de duração
-        if duracao > 12:
-            response += f"   - ⏰ Duração de {duracao} meses é longa. Considere dividir em fases menores.\n"
-        elif duracao < 3:
-            response += f"   - ⏰ Duração de {duracao} meses pode ser muito curta para projetos complexos.\n"
-        
-        # Análise de orçamento
-        if orcamento < 400000:
-            response += f"   - 💰 Orçamento de R${orcamento:,} está abaixo da média. Considere aumentar o investimento.\n"
-        elif orcamento > 1500000:
-            response += f"   - 💰 Orçamento alto de R${orcamento:,}. Certifique-se de que há ROI adequado.\n"
-        
-        # Análise de equipe
-        if tamanho_equipe < 5:
-            response += f"   - 👥 Equipe pequena ({tamanho_equipe} pessoas). Considere reforçar com mais membros.\n"
-        elif tamanho_equipe > 20:
-            response += f"   - 👥 Equipe grande ({tamanho_equipe} pessoas). Atenção à coordenação e comunicação.\n"
-        
-        # Análise de recursos
-        if recursos == "Baixo":
-            response += "   - 🔧 Recursos limitados podem impactar o sucesso. Considere aumentar o suporte.\n"
-        elif recursos == "Alto":
-            response += "   - 🔧 Recursos abundantes são um grande diferencial para o sucesso.\n"
-        
-        # Recomendações baseadas no perfil do usuário
-        if self.current_user:
-            if self.current_user['Sucesso_medio'] > 80:
-                response += f"   - 🌟 Seu histórico de {self.current_user['Sucesso_medio']}% de sucesso é excelente!\n"
-            elif self.current_user['Sucesso_medio'] < 70:
-                response += f"   - 📚 Considere buscar mentoria ou treinamento para melhorar sua taxa de sucesso.\n"
-            
-            if self.current_user['Experiencia_anos'] >= 5:
-                response += f"   - 💼 Sua experiência de {self.current_user['Experiencia_anos']} anos é um grande ativo.\n"
-        
-        response += "\n🎯 **Próximos passos sugeridos:**\n"
-        response += "   1. Revisar o planejamento com base nas recomendações\n"
-        response += "   2. Alinhar expectativas com stakeholders\n"
-        response += "   3. Implementar controles de qualidade\n"
-        response += "   4. Monitorar progresso regularmente\n"
-        
-        return response
+        return render_analysis(prediction_result)
     
     def start_conversation(self):
         """Inicia a conversa com o usuário"""
@@ -155,7 +96,7 @@ class ProjectSuccessChatbot:
         
         # Identificar usuário
         user_name = input("Para começar, qual é o seu nome? ")
-        self.current_user = self.get_user_by_name(user_name)
+        self.current_user = self.identify_user(user_name)
         
         if self.current_user:
             print(f"\n✅ Usuário encontrado: {self.current_user['Nome']}")
@@ -166,11 +107,17 @@ class ProjectSuccessChatbot:
             print(f"\n⚠️ Usuário '{user_name}' não encontrado na base de dados.")
             print("Continuando sem dados históricos do usuário...\n")
         
-        # Coletar dados do projeto
-        self.collect_project_data()
-        
-        # Fazer previsão
-        self.make_prediction()
+        # Coletar dados e fazer previsões até o usuário encerrar
+        while True:
+            self.collect_project_data()
+            self.make_prediction()
+            
+            # Opção de fazer nova análise
+            print("\n" + "="*50)
+            nova_analise = input("Deseja analisar outro projeto? (s/n): ")
+            if nova_analise.lower() not in ['s', 'sim', 'y', 'yes']:
+                break
+            self.project_data = {}
     
     def collect_project_data(self):
         """Coleta dados do projeto do usuário"""
@@ -254,14 +201,6 @@ class ProjectSuccessChatbot:
             print(f"\n{response}")
         else:
             print("\n❌ Erro ao fazer previsão. Verifique se a API está funcionando.")
-        
-        # Opção de fazer nova análise
-        print("\n" + "="*50)
-        nova_analise = input("Deseja analisar outro projeto? (s/n): ")
-        if nova_analise.lower() in ['s', 'sim', 'y', 'yes']:
-            self.project_data = {}
-            self.collect_project_data()
-            self.make_prediction()
     
     def run_interactive_mode(self):
         """Executa o modo interativo do chatbot"""
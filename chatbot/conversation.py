@@ -0,0 +1,266 @@
+import time
+from collections import OrderedDict
+
+from api_client import UserNotFoundError
+
+# Estados da conversa (inteiros, para manter as sessões compactas)
+STATE_START = 0
+STATE_ASK_NAME = 1
+STATE_ASK_DURACAO = 2
+STATE_ASK_ORCAMENTO = 3
+STATE_ASK_EQUIPE = 4
+STATE_ASK_RECURSOS = 5
+STATE_ASK_AGAIN = 6
+STATE_DONE = 7
+
+STATE_NAMES = {
+    STATE_START: 'start',
+    STATE_ASK_NAME: 'ask_name',
+    STATE_ASK_DURACAO: 'ask_duracao',
+    STATE_ASK_ORCAMENTO: 'ask_orcamento',
+    STATE_ASK_EQUIPE: 'ask_equipe',
+    STATE_ASK_RECURSOS: 'ask_recursos',
+    STATE_ASK_AGAIN: 'ask_again',
+    STATE_DONE: 'done'
+}
+
+RECURSOS_OPTIONS = {'1': 'Alto', '2': 'Médio', '3': 'Baixo'}
+
+RECURSOS_PROMPT = ("Nível de recursos disponíveis:\n"
+                   "1. Alto\n"
+                   "2. Médio\n"
+                   "3. Baixo\n"
+                   "Escolha uma opção (1-3):")
+
+YES_ANSWERS = ['s', 'sim', 'y', 'yes']
+
+
+# Ícones das recomendações retornadas pelo /analyze, por categoria
+RECOMMENDATION_ICONS = {
+    'duracao': '⏰',
+    'orcamento': '💰',
+    'tamanho_equipe': '👥',
+    'recursos': '🔧',
+    'perfil': '💡'
+}
+
+# Ícones dos níveis de avaliação da probabilidade de sucesso
+ASSESSMENT_ICONS = {'alta': '✅', 'moderada': '⚠️', 'baixa': '🔴'}
+
+PROFILE_ICONS = {
+    'historico_excelente': '🌟',
+    'buscar_mentoria': '📚',
+    'experiencia_ativo': '💼'
+}
+
+
+def render_analysis(analysis):
+    """Formata a análise estruturada do /analyze como resposta do chatbot"""
+    # Resposta base
+    response = f"🎯 **Análise do Projeto**\n\n"
+
+    # Informações do usuário
+    user = analysis.get('user')
+    if user:
+        response += f"📊 **Perfil do Usuário:** {user['Nome']} ({user['Cargo']})\n"
+        response += f"   - Experiência: {user['Experiencia_anos']} anos\n"
+        response += f"   - Taxa de sucesso histórica: {user['Sucesso_medio']}%\n\n"
+
+    # Resultado da previsão
+    response += f"📈 **Previsão do Modelo:** {analysis['interpretation']['success_percentage']} de chance de sucesso\n\n"
+
+    # Análise personalizada
+    assessment = analysis['assessment']
+    response += f"{ASSESSMENT_ICONS.get(assessment['level'], '')} **{assessment['title']}** {assessment['message']}\n"
+
+    # Recomendações calculadas pela API
+    response += "\n💡 **Recomendações:**\n"
+    for recommendation in analysis['recommendations']:
+        icon = PROFILE_ICONS.get(recommendation['code']) or RECOMMENDATION_ICONS.get(recommendation['category'], '-')
+        response += f"   - {icon} {recommendation['message']}\n"
+
+    response += "\n🎯 **Próximos passos sugeridos:**\n"
+    for position, step in enumerate(analysis['next_steps'], start=1):
+        response += f"   {position}. {step}\n"
+
+    return response
+
+
+class Session:
+    """Estado de uma conversa; apenas os campos necessários, sem __dict__"""
+
+    __slots__ = ('session_id', 'state', 'user_name', 'duracao', 'orcamento',
+                 'tamanho_equipe', 'recursos', 'last_seen')
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.state = STATE_START
+        # Nome informado; o perfil é buscado pela API a cada análise
+        self.user_name = None
+        self.reset_project()
+        self.last_seen = time.monotonic()
+
+    def reset_project(self):
+        self.duracao = None
+        self.orcamento = None
+        self.tamanho_equipe = None
+        self.recursos = None
+
+    @property
+    def project_data(self):
+        return {
+            'duracao': self.duracao,
+            'orcamento': self.orcamento,
+            'tamanho_equipe': self.tamanho_equipe,
+            'recursos': self.recursos
+        }
+
+
+class SessionStore:
+    """Sessões indexadas por ID, com limite de tamanho (LRU) e expiração por inatividade"""
+
+    def __init__(self, max_sessions=100000, ttl=1800):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get_or_create(self, session_id):
+        session = self._sessions.get(session_id)
+        now = time.monotonic()
+        if session is None or now - session.last_seen > self.ttl:
+            session = Session(session_id)
+            self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        session.last_seen = now
+
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return session
+
+    def discard(self, session_id):
+        self._sessions.pop(session_id, None)
+
+    def evict_expired(self):
+        """Remove sessões inativas; as mais antigas ficam no início da fila"""
+        now = time.monotonic()
+        evicted = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_seen <= self.ttl:
+                break
+            self._sessions.popitem(last=False)
+            evicted += 1
+        return evicted
+
+
+def _parse_positive(text, cast):
+    """Converte a mensagem em número positivo, ou None se inválida"""
+    try:
+        value = cast(text)
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+class ConversationEngine:
+    """Máquina de estados não bloqueante para conversas do chatbot
+
+    Cada chamada a `handle` processa uma mensagem de uma sessão e retorna a
+    resposta, sem `input()` nem recursão: o estado fica todo na `Session`,
+    então um único processo atende milhares de conversas concorrentes.
+
+    `analyze(projeto, nome_do_usuario)` é uma corrotina que retorna a análise
+    estruturada do endpoint /analyze; o perfil é resolvido pela API a partir do
+    nome, então o processo não mantém a base de usuários.
+    """
+
+    def __init__(self, analyze, sessions=None):
+        self.analyze = analyze
+        self.sessions = sessions or SessionStore()
+
+    async def handle(self, session_id, message):
+        """Processa uma mensagem e retorna (resposta, sessão)"""
+        session = self.sessions.get_or_create(session_id)
+        message = (message or '').strip()
+
+        if session.state == STATE_START:
+            session.state = STATE_ASK_NAME
+            reply = ("🤖 Olá! Sou o assistente de análise de projetos.\n"
+                     "Vou te ajudar a prever o sucesso do seu projeto com base em dados históricos.\n\n"
+                     "Para começar, qual é o seu nome?")
+        elif session.state == STATE_ASK_NAME:
+            reply = self._handle_name(session, message)
+        elif session.state == STATE_ASK_DURACAO:
+            session.duracao = _parse_positive(message, float)
+            if session.duracao is None:
+                reply = "❌ A duração deve ser um número positivo. Duração estimada do projeto (em meses):"
+            else:
+                session.state = STATE_ASK_ORCAMENTO
+                reply = "Orçamento total do projeto (em R$):"
+        elif session.state == STATE_ASK_ORCAMENTO:
+            session.orcamento = _parse_positive(message, float)
+            if session.orcamento is None:
+                reply = "❌ O orçamento deve ser um número positivo. Orçamento total do projeto (em R$):"
+            else:
+                session.state = STATE_ASK_EQUIPE
+                reply = "Número de pessoas na equipe:"
+        elif session.state == STATE_ASK_EQUIPE:
+            session.tamanho_equipe = _parse_positive(message, int)
+            if session.tamanho_equipe is None:
+                reply = "❌ O tamanho da equipe deve ser um número inteiro positivo. Número de pessoas na equipe:"
+            else:
+                session.state = STATE_ASK_RECURSOS
+                reply = RECURSOS_PROMPT
+        elif session.state == STATE_ASK_RECURSOS:
+            reply = await self._handle_recursos(session, message)
+        elif session.state == STATE_ASK_AGAIN:
+            if message.lower() in YES_ANSWERS:
+                session.reset_project()
+                session.state = STATE_ASK_DURACAO
+                reply = "📋 Duração estimada do projeto (em meses):"
+            else:
+                session.state = STATE_DONE
+                reply = "👋 Obrigado por usar o assistente de análise de projetos!"
+        else:
+            reply = "A conversa foi encerrada. Envie uma nova mensagem com outro session_id para recomeçar."
+
+        if session.state == STATE_DONE:
+            self.sessions.discard(session.session_id)
+        return reply, session
+
+    def _handle_name(self, session, name):
+        session.user_name = name or None
+        session.state = STATE_ASK_DURACAO
+
+        if session.user_name:
+            reply = f"Olá, {name}! Seu perfil será consultado na base de dados durante a análise.\n\n"
+        else:
+            reply = "Continuando sem dados históricos do usuário...\n\n"
+        return reply + "📋 Duração estimada do projeto (em meses):"
+
+    async def _handle_recursos(self, session, message):
+        recursos = RECURSOS_OPTIONS.get(message)
+        if recursos is None:
+            return "❌ Opção inválida. Escolha 1, 2 ou 3.\n" + RECURSOS_PROMPT
+
+        session.recursos = recursos
+        session.state = STATE_ASK_AGAIN
+        warning = ''
+        try:
+            try:
+                analysis = await self.analyze(session.project_data, session.user_name)
+            except UserNotFoundError as e:
+                warning = f"⚠️ Usuário '{session.user_name}' não encontrado na base de dados.\n"
+                if e.suggestions:
+                    warning += f"Você quis dizer: {', '.join(e.suggestions)}?\n"
+                warning += "Continuando sem dados históricos do usuário...\n\n"
+                session.user_name = None
+                analysis = await self.analyze(session.project_data, None)
+        except Exception:
+            return (warning + "❌ Erro ao fazer previsão. Verifique se a API está funcionando.\n\n"
+                    "Deseja analisar outro projeto? (s/n)")
+
+        return warning + render_analysis(analysis) + "\nDeseja analisar outro projeto? (s/n)"
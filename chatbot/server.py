@@ -0,0 +1,207 @@
+import argparse
+import asyncio
+import json
+import os
+import uuid
+from http import HTTPStatus
+
+from api_client import AsyncPredictionClient, PredictionClient
+from conversation import STATE_NAMES, ConversationEngine, SessionStore
+
+# Tamanho máximo do corpo de uma mensagem
+MAX_BODY_BYTES = 64 * 1024
+
+# Prazo para receber uma requisição completa (linha, cabeçalhos e corpo),
+# contado desde o início da espera em uma conexão keep-alive
+KEEP_ALIVE_TIMEOUT = 15
+
+# Número máximo de cabeçalhos por requisição
+MAX_HEADERS = 100
+
+
+class RequestError(Exception):
+    """Requisição recusada na leitura; respondida com `status` e a conexão é fechada"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def _readline(reader):
+    """readline que recusa com 431 linhas maiores que o limite do StreamReader (64 KiB)"""
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise RequestError(431, 'Linha de requisição ou cabeçalho muito longo') from None
+
+
+class ChatServer:
+    """Servidor HTTP asyncio que atende várias conversas do chatbot em um só processo
+
+    POST /chat com {"session_id": "...", "message": "..."} processa uma mensagem;
+    sem session_id, uma nova sessão é criada e o ID volta na resposta.
+    """
+
+    def __init__(self, engine, eviction_interval=60):
+        self.engine = engine
+        self.eviction_interval = eviction_interval
+
+    async def _read_request(self, reader):
+        """Lê uma requisição HTTP/1.1; retorna None quando o cliente fecha a conexão
+
+        Sem prazo próprio: handle_connection limita a leitura inteira com
+        KEEP_ALIVE_TIMEOUT. Lança RequestError para requisições recusadas.
+        """
+        request_line = await _readline(reader)
+        if not request_line:
+            return None
+
+        try:
+            method, path, version = request_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+        except ValueError:
+            raise RequestError(400, 'Requisição inválida') from None
+
+        headers = {}
+        # Conta as linhas, não as chaves: cabeçalhos repetidos também contam
+        for _ in range(MAX_HEADERS + 1):
+            line = await _readline(reader)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise RequestError(431, 'Cabeçalhos demais')
+
+        # Corpos chunked não são suportados; sem isso seriam lidos como vazios
+        if 'transfer-encoding' in headers:
+            raise RequestError(411, 'Content-Length obrigatório')
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise RequestError(400, 'Content-Length inválido') from None
+        if length < 0:
+            raise RequestError(400, 'Content-Length inválido')
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, 'Mensagem muito grande')
+        body = await reader.readexactly(length) if length else b''
+        return method, path, version, headers, body
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        status = HTTPStatus(status)
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+        )
+
+    async def _dispatch(self, method, path, body):
+        if path == '/health' and method == 'GET':
+            return 200, {'status': 'healthy', 'active_sessions': len(self.engine.sessions)}
+
+        if path != '/chat':
+            return 404, {'error': 'Endpoint não encontrado'}
+        if method != 'POST':
+            return 405, {'error': 'Método não permitido'}
+
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            return 400, {'error': 'JSON inválido'}
+        if not isinstance(data, dict):
+            return 400, {'error': 'Formato inválido. Esperado: {"session_id": "...", "message": "..."}'}
+
+        session_id = str(data.get('session_id') or uuid.uuid4().hex)
+        reply, session = await self.engine.handle(session_id, str(data.get('message', '')))
+        return 200, {
+            'session_id': session_id,
+            'reply': reply,
+            'state': STATE_NAMES[session.state]
+        }
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    # Um único prazo para a requisição inteira: um cliente lento não segura a conexão
+                    request = await asyncio.wait_for(self._read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except RequestError as e:
+                    self._write_response(writer, e.status, {'error': e.message}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, path, version, headers, body = request
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                try:
+                    status, payload = await self._dispatch(method, path, body)
+                except Exception as e:
+                    print(f"Erro ao processar {method} {path}: {e}")
+                    status, payload = 500, {'error': 'Erro interno do servidor'}
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def evict_sessions(self):
+        """Remove periodicamente as sessões inativas"""
+        while True:
+            await asyncio.sleep(self.eviction_interval)
+            self.engine.sessions.evict_expired()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        eviction_task = asyncio.get_running_loop().create_task(self.evict_sessions())
+        print(f"Servidor do chatbot em http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            eviction_task.cancel()
+
+
+async def run(args):
+    # Cliente fino: os perfis de usuários são resolvidos pela API no /analyze
+    client = AsyncPredictionClient(
+        PredictionClient(args.api_url), max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+
+    async def analyze(project, user_name):
+        return await client.analyze(project, user_name=user_name)
+
+    engine = ConversationEngine(
+        analyze=analyze,
+        sessions=SessionStore(max_sessions=args.max_sessions, ttl=args.session_ttl)
+    )
+    try:
+        await ChatServer(engine).serve(args.host, args.port)
+    finally:
+        await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor multi-sessão do chatbot de análise de projetos')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--api-url', default=os.environ.get('API_URL', 'http://localhost:5000'))
+    parser.add_argument('--max-sessions', type=int, default=100000, help='Sessões mantidas em memória')
+    parser.add_argument('--session-ttl', type=float, default=1800, help='Segundos de inatividade até expirar')
+    parser.add_argument('--max-batch-size', type=int, default=32, help='Análises agrupadas por chamada à API')
+    parser.add_argument('--max-wait-ms', type=float, default=10, help='Espera máxima para formar um lote')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+import csv
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+# A normalização de nomes é a mesma das categorias do modelo; text_normalization
+# só usa a biblioteca padrão, então o chatbot não carrega numpy nem joblib
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ml_model'))
+
+from text_normalization import normalize_category
+
+# Colunas de usuarios.csv, na ordem do arquivo
+USER_FIELDS = ['Usuario_ID', 'Nome', 'Cargo', 'Historico_projetos', 'Experiencia_anos', 'Sucesso_medio']
+NUMERIC_FIELDS = ['Usuario_ID', 'Historico_projetos', 'Experiencia_anos', 'Sucesso_medio']
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _parse_number(value):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+class UserRecord:
+    """Perfil de usuário compacto; aceita acesso por chave, como um dicionário"""
+
+    __slots__ = USER_FIELDS
+
+    def __init__(self, row):
+        for field in USER_FIELDS:
+            value = row[field]
+            setattr(self, field, _parse_number(value) if field in NUMERIC_FIELDS else value)
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in USER_FIELDS}
+
+
+class _UserIndex:
+    """Índices imutáveis montados a partir de um arquivo de usuários"""
+
+    def __init__(self, records):
+        self.by_key = {}
+        self.by_id = {}
+        for record in records:
+            # Nomes repetidos: vale o primeiro, como na busca original
+            self.by_key.setdefault(normalize_category(record.Nome), record)
+            self.by_id.setdefault(record.Usuario_ID, record)
+
+        self.sorted_keys = sorted(self.by_key)
+
+        # Número de trigramas de cada nome, usado no denominador da similaridade
+        self.trigram_counts = []
+        self.trigram_index = {}
+        for key_id, key in enumerate(self.sorted_keys):
+            trigrams = _trigrams(key)
+            self.trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                self.trigram_index.setdefault(trigram, []).append(key_id)
+
+
+class UserStore:
+    """Base de usuários indexada em memória
+
+    O índice por nome normalizado (acentos, caixa e espaços) é montado uma vez
+    no carregamento, então cada busca exata é O(1). Buscas por prefixo usam a
+    lista ordenada de nomes e a busca aproximada usa um índice de trigramas.
+    O arquivo é recarregado quando muda em disco (verificado no máximo a cada
+    `check_interval` segundos).
+    """
+
+    def __init__(self, filepath, check_interval=2.0):
+        self.filepath = filepath
+        self.check_interval = check_interval
+        self._index = _UserIndex([])
+        self._file_signature = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        if not self.reload():
+            raise ValueError(f"Base de usuários inválida: {self.filepath}")
+
+    def __len__(self):
+        return len(self._index.by_key)
+
+    def _signature(self):
+        stat = os.stat(self.filepath)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self):
+        """Lê o arquivo e troca os índices de uma só vez
+
+        Se alguma linha for inválida, os índices atuais são mantidos e o
+        retorno é False; a assinatura é registrada mesmo assim, então o
+        arquivo só é lido de novo quando mudar outra vez.
+        """
+        with self._lock:
+            signature = self._signature()
+            self._file_signature = signature
+            self._next_check = time.monotonic() + self.check_interval
+            with open(self.filepath, newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                try:
+                    records = [UserRecord(row) for row in reader]
+                except (KeyError, TypeError, ValueError) as e:
+                    # Coluna ausente (KeyError), linha curta (None) ou número inválido
+                    print(f"Linha {reader.line_num} inválida em {self.filepath}, "
+                          f"mantendo a base atual: {e!r}")
+                    return False
+            self._index = _UserIndex(records)
+            return True
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        try:
+            if self._signature() != self._file_signature:
+                self.reload()
+        except OSError as e:
+            # Mantém os dados atuais se o arquivo estiver sendo substituído
+            print(f"Erro ao recarregar base de usuários: {e}")
+
+    def get(self, name):
+        """Busca exata pelo nome normalizado"""
+        self._reload_if_changed()
+        return self._index.by_key.get(normalize_category(name))
+
+    def get_by_id(self, user_id):
+        """Busca pelo Usuario_ID (aceita o ID como texto)"""
+        self._reload_if_changed()
+        try:
+            return self._index.by_id.get(int(user_id))
+        except (TypeError, ValueError):
+            return None
+
+    def search_prefix(self, prefix, limit=10):
+        """Usuários cujo nome normalizado começa com `prefix`"""
+        self._reload_if_changed()
+        index = self._index
+        prefix = normalize_category(prefix)
+
+        results = []
+        position = bisect_left(index.sorted_keys, prefix)
+        while position < len(index.sorted_keys) and len(results) < limit:
+            key = index.sorted_keys[position]
+            if not key.startswith(prefix):
+                break
+            results.append(index.by_key[key])
+            position += 1
+        return results
+
+    def search_fuzzy(self, name, limit=5, min_similarity=0.5):
+        """Usuários com nomes parecidos, ordenados pela similaridade de trigramas (Dice)"""
+        self._reload_if_changed()
+        index = self._index
+        query = _trigrams(normalize_category(name))
+
+        shared = Counter()
+        for trigram in query:
+            shared.update(index.trigram_index.get(trigram, ()))
+
+        scored = []
+        for key_id, count in shared.items():
+            similarity = 2 * count / (len(query) + index.trigram_counts[key_id])
+            if similarity >= min_similarity:
+                scored.append((similarity, index.sorted_keys[key_id]))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [index.by_key[key] for _, key in scored[:limit]]
@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Tipos compactos das colunas de projetos.csv usadas no treinamento
+TRAINING_DTYPES = {
+    'Duracao_meses': 'int16',
+    'Orcamento': 'float32',
+    'Tamanho_equipe': 'int16',
+    'Recursos_disponiveis': 'category',
+    'Sucesso': 'int8'
+}
+
+# Colunas lidas por padrão: Projeto_ID não é usado no treinamento
+TRAINING_COLUMNS = list(TRAINING_DTYPES)
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+FEATHER_EXTENSIONS = ('.feather', '.arrow')
+
+
+def file_format(filepath):
+    """Formato do arquivo pela extensão: 'parquet', 'feather' ou 'csv'"""
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        return 'parquet'
+    if extension in FEATHER_EXTENSIONS:
+        return 'feather'
+    return 'csv'
+
+
+def _dtypes_for(columns):
+    return {column: TRAINING_DTYPES[column] for column in columns if column in TRAINING_DTYPES}
+
+
+def _apply_dtypes(data, columns):
+    """Converte para os tipos compactos apenas as colunas que ainda não os têm"""
+    for column, dtype in _dtypes_for(columns).items():
+        if data[column].dtype != dtype:
+            data[column] = data[column].astype(dtype)
+    return data
+
+
+def iter_project_chunks(filepath, chunksize, columns=None):
+    """Lê projetos em blocos de `chunksize` linhas, já com os tipos compactos
+
+    CSV é lido com `read_csv(chunksize=...)` e Parquet pelos lotes do pyarrow;
+    apenas um bloco fica em memória por vez.
+    """
+    columns = columns or TRAINING_COLUMNS
+    data_format = file_format(filepath)
+
+    if data_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(filepath)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield _apply_dtypes(batch.to_pandas(), columns)[columns]
+    elif data_format == 'feather':
+        raise ValueError("Leitura em blocos disponível apenas para CSV e Parquet")
+    else:
+        reader = pd.read_csv(filepath, usecols=columns, dtype=_dtypes_for(columns), chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                yield chunk[columns]
+
+
+def _concat_chunks(chunks):
+    """Junta os blocos mantendo as colunas categóricas (as categorias podem variar entre blocos)"""
+    for column in chunks[0].columns:
+        if isinstance(chunks[0][column].dtype, pd.CategoricalDtype):
+            categories = union_categoricals([chunk[column] for chunk in chunks]).categories
+            for chunk in chunks:
+                chunk[column] = chunk[column].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True, copy=False)
+
+
+def load_projects(filepath, columns=None, chunksize=None):
+    """Carrega projetos com tipos compactos e apenas as colunas pedidas
+
+    CSV é lido com os dtypes definidos na leitura (opcionalmente em blocos de
+    `chunksize` linhas); Parquet e Feather leem só as colunas projetadas.
+    Retorna um DataFrame com `columns` (padrão: TRAINING_COLUMNS), sem cópias
+    intermediárias do conjunto completo.
+    """
+    columns = columns or TRAINING_COLUMNS
+    data_format = file_format(filepath)
+
+    if data_format == 'parquet':
+        data = pd.read_parquet(filepath, columns=columns)
+    elif data_format == 'feather':
+        data = pd.read_feather(filepath, columns=columns)
+    elif chunksize:
+        data = _concat_chunks(list(iter_project_chunks(filepath, chunksize, columns)))
+    else:
+        data = pd.read_csv(filepath, usecols=columns, dtype=_dtypes_for(columns))[columns]
+
+    return _apply_dtypes(data, columns)
+
+
+def encode_categories(values, label_encoder, fit=True):
+    """Codifica uma coluna com o LabelEncoder, como int8
+
+    Em colunas categóricas, só as poucas categorias passam pelo encoder e os
+    códigos são traduzidos por indexação, sem materializar os textos linha a linha.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        encoded = label_encoder.fit_transform(values) if fit else label_encoder.transform(values)
+        return encoded.astype(np.int8)
+
+    values = values.cat.remove_unused_categories()
+    if fit:
+        label_encoder.fit(values.cat.categories)
+
+    codes = values.cat.codes.to_numpy()
+    if (codes < 0).any():
+        raise ValueError(f"Valores ausentes na coluna {values.name}")
+
+    mapping = label_encoder.transform(values.cat.categories).astype(np.int8)
+    return mapping[codes]
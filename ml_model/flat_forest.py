@@ -0,0 +1,161 @@
+import os
+import tempfile
+
+import joblib
+import numpy as np
+
+# Arrays que compõem a floresta exportada
+ARRAY_FIELDS = ['feature', 'threshold', 'left', 'right', 'value', 'roots', 'classes_']
+
+
+def _tree_values_are_normalized():
+    """Indica se tree_.value já guarda frações (scikit-learn >= 1.4)"""
+    # Importação local: só a exportação da floresta precisa do scikit-learn
+    import sklearn
+
+    major, minor = (int(part) for part in sklearn.__version__.split('.')[:2])
+    return (major, minor) >= (1, 4)
+
+
+class FlatForest:
+    """Floresta de decisão exportada para arrays NumPy contíguos
+
+    Todas as árvores ficam concatenadas em um único conjunto de arrays
+    (feature, threshold, left, right, value). As folhas apontam para si mesmas,
+    o que permite percorrer todas as árvores ao mesmo tempo com um número fixo
+    de passos vetorizados, sem a validação e o despacho do joblib que o
+    scikit-learn faz a cada chamada.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, classes, metadata=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        # Informações do modelo de origem gravadas junto com os arrays
+        self.metadata = metadata or {}
+
+    @classmethod
+    def from_forest(cls, forest):
+        """Exporta um RandomForestClassifier treinado"""
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        n_classes = len(forest.classes_)
+        normalized = _tree_values_are_normalized()
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            node_ids = np.arange(tree.node_count, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            # Folhas viram pontos fixos: qualquer comparação as mantém no lugar
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+            # Mesmas operações de DecisionTreeClassifier.predict_proba, para
+            # que as probabilidades sejam idênticas bit a bit
+            value = tree.value[:, 0, :n_classes].astype(np.float64)
+            if not normalized:
+                normalizer = value.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer
+            values.append(value)
+
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features)),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds)),
+            left=np.ascontiguousarray(np.concatenate(lefts)),
+            right=np.ascontiguousarray(np.concatenate(rights)),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(tree.max_depth for tree in trees),
+            classes=np.asarray(forest.classes_)
+        )
+
+    def save(self, filepath):
+        """Salva os arrays sem compressão, para permitir carregamento mapeado em memória
+
+        O arquivo é gravado ao lado do destino e trocado com os.replace: processos
+        que ainda mapeiam a versão anterior continuam lendo o arquivo antigo, em
+        vez de vê-lo truncado (SIGBUS) ou com arrays misturados.
+        """
+        engine_data = {field: getattr(self, field) for field in ARRAY_FIELDS}
+        engine_data['max_depth'] = self.max_depth
+        engine_data['metadata'] = self.metadata
+
+        directory = os.path.dirname(os.path.abspath(filepath))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(filepath)}.')
+        os.close(fd)
+        try:
+            joblib.dump(engine_data, tmp_path)
+            # mkstemp cria o arquivo legível apenas pelo dono
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, filepath, mmap_mode='r'):
+        """Carrega os arrays; com mmap_mode='r' as páginas são compartilhadas entre processos"""
+        engine_data = joblib.load(filepath, mmap_mode=mmap_mode)
+        return cls(
+            feature=engine_data['feature'],
+            threshold=engine_data['threshold'],
+            left=engine_data['left'],
+            right=engine_data['right'],
+            value=engine_data['value'],
+            roots=engine_data['roots'],
+            max_depth=engine_data['max_depth'],
+            classes=engine_data['classes_'],
+            metadata=engine_data.get('metadata')
+        )
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """Retorna o índice da folha atingida em cada árvore, shape (n, n_arvores)"""
+        n_samples = X.shape[0]
+        rows = np.arange(n_samples)[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (n_samples, self.n_estimators)).copy()
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return nodes
+
+    def predict_proba(self, X):
+        """Calcula as probabilidades de cada classe, idênticas às do scikit-learn"""
+        # O scikit-learn converte as entradas para float32 antes de comparar
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        return self.predict_proba_uncast(X)
+
+    def predict_proba_uncast(self, X):
+        """Mesmo cálculo de predict_proba, comparando X exatamente como recebido (sem float32)"""
+        leaf_values = self.value[self.apply(X)]
+
+        # Soma sequencial árvore a árvore, na mesma ordem de acumulação do
+        # RandomForestClassifier (cumsum não usa soma pareada)
+        proba = np.cumsum(leaf_values, axis=1)[:, -1]
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X):
+        """Retorna a classe de maior probabilidade para cada amostra"""
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,461 @@
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from flat_forest import FlatForest
+from model_artifact import load_artifact
+from prediction_grid import DEFAULT_MAX_CELLS, PredictionGrid
+from text_normalization import normalize_category
+
+# Campos esperados em cada projeto enviado para previsão
+PROJECT_FIELDS = ['duracao', 'orcamento', 'tamanho_equipe', 'recursos']
+
+# Colunas numéricas de projetos.csv usadas como features, na ordem do modelo
+NUMERIC_COLUMNS = ['Duracao_meses', 'Orcamento', 'Tamanho_equipe']
+
+# Ordem completa das features do modelo
+FEATURE_COLUMNS = NUMERIC_COLUMNS + ['Recursos_disponiveis']
+
+# Regras dos campos numéricos de um projeto: (campo, só inteiros, mensagem de erro);
+# compartilhadas pelo /predict, pelo /analyze e pelas previsões em lote
+NUMERIC_FIELD_RULES = [
+    ('duracao', False, 'Duração deve ser um número positivo'),
+    ('orcamento', False, 'Orçamento deve ser um número positivo'),
+    ('tamanho_equipe', True, 'Tamanho da equipe deve ser um número inteiro positivo')
+]
+
+_NUMBER_TYPES = (int, float, np.integer, np.floating)
+_INTEGER_TYPES = (int, np.integer)
+_MAX_FLOAT = sys.float_info.max
+
+
+def parse_positive(value, integer=False):
+    """Retorna o valor se for um número positivo e finito (inteiro se `integer`), ou None"""
+    if isinstance(value, bool) or not isinstance(value, _INTEGER_TYPES if integer else _NUMBER_TYPES):
+        return None
+    # Escalares numpy viram números Python para que o limite não seja convertido para float32
+    number = value.item() if isinstance(value, np.generic) else value
+    # O limite superior recusa NaN, infinito e inteiros fora do float64, que seguem
+    # ramos diferentes no sklearn e no FlatForest (como math.isfinite, sem OverflowError)
+    return value if 0 < number <= _MAX_FLOAT else None
+
+
+class UnknownCategoryError(ValueError):
+    """Categoria não vista no treinamento"""
+
+
+class CategoryEncoder:
+    """Codificação pré-compilada de uma feature categórica
+
+    Montada uma vez ao carregar ou treinar o modelo: cada classe do
+    LabelEncoder e sua forma normalizada apontam para o mesmo código, de modo
+    que 'Médio', 'medio' e 'MEDIO' são aceitos e codificar um valor é uma
+    consulta a um dicionário, sem o scikit-learn.
+    """
+
+    def __init__(self, name, classes):
+        self.name = name
+        self.classes_ = [str(label) for label in classes]
+        self.codes = {}
+        for code, label in enumerate(self.classes_):
+            self.codes[label] = code
+            self.codes.setdefault(normalize_category(label), code)
+        self.error_message = f"{name} deve ser: {', '.join(self.classes_)}"
+
+    def code(self, value):
+        """Código do valor, ou None se a categoria é desconhecida"""
+        if not isinstance(value, str):
+            return None
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes.get(normalize_category(value))
+        return code
+
+    def canonical(self, value):
+        """Classe correspondente ao valor ('medio' -> 'Médio'), ou None"""
+        code = self.code(value)
+        return None if code is None else self.classes_[code]
+
+    def encode(self, value):
+        code = self.code(value)
+        if code is None:
+            raise UnknownCategoryError(f"Categoria desconhecida em {self.name}: {value!r}. {self.error_message}")
+        return code
+
+    def map_codes(self, series):
+        """Códigos de uma Series do pandas (NaN nas desconhecidas), normalizando só os valores distintos"""
+        return series.map({value: self.code(value) for value in series.unique()})
+
+
+class ProjectPredictor:
+    """Preditor somente de inferência: carrega o modelo salvo e faz previsões
+
+    Não importa pandas nem os módulos de treinamento do scikit-learn, para que
+    a API e os workers iniciem rápido; o treinamento fica em
+    model.ProjectSuccessPredictor, que estende esta classe.
+    """
+
+    def __init__(self, single_pass=True, use_flat_engine=False, use_grid=False, grid_max_cells=DEFAULT_MAX_CELLS):
+        self.model = None
+        self.label_encoder = None
+        self.is_trained = False
+        # Identifica o modelo treinado; muda a cada novo treinamento
+        self.model_version = None
+        # Deriva a classe do argmax de predict_proba, percorrendo as árvores uma única vez
+        self.single_pass = single_pass
+        # Usa a floresta exportada em arrays NumPy (FlatForest) em vez do sklearn
+        self.use_flat_engine = use_flat_engine
+        self.engine = None
+        # Usa a tabela pré-computada de probabilidades (PredictionGrid), quando couber em grid_max_cells
+        self.use_grid = use_grid
+        self.grid_max_cells = grid_max_cells
+        self.grid = None
+        # Duração do último load_model, em segundos
+        self.load_duration = None
+        # Manifest do artefato carregado (None para modelos .pkl)
+        self.manifest = None
+        # Codificação de Recursos_disponiveis, compilada ao carregar ou treinar
+        self.recursos_encoder = None
+    
+    def compile_encoders(self, classes=None):
+        """Pré-compila a codificação das features categóricas a partir das classes do encoder"""
+        if classes is None:
+            classes = self.label_encoder.classes_
+        self.recursos_encoder = CategoryEncoder('Recursos', classes)
+        return self.recursos_encoder
+    
+    def compile_engine(self):
+        """Exporta a floresta treinada para o motor de inferência em arrays planos"""
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda!")
+        
+        # Carregado só a partir dos arrays: o motor já é a floresta exportada
+        if self.model is None:
+            return self.engine
+        
+        self.engine = FlatForest.from_forest(self.model)
+        return self.engine
+    
+    def compile_grid(self, max_cells=None):
+        """Pré-computa as probabilidades de todas as células do espaço de features
+        
+        Lança ValueError se a tabela exceder `max_cells` (padrão: grid_max_cells).
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda!")
+        
+        # Sem o motor em uso, a floresta é exportada só para compilar a tabela
+        if self.model is None or (self.use_flat_engine and self.engine is not None):
+            engine = self.engine
+        else:
+            engine = FlatForest.from_forest(self.model)
+        self.grid = PredictionGrid.from_forest(
+            engine, len(FEATURE_COLUMNS), max_cells=max_cells or self.grid_max_cells
+        )
+        return self.grid
+    
+    def _compile_optional_grid(self):
+        """Compila a tabela se use_grid estiver ativo; se não couber no limite, segue com a floresta"""
+        self.grid = None
+        if not self.use_grid:
+            return
+        try:
+            start = time.perf_counter()
+            grid = self.compile_grid()
+            print(f"Tabela de previsões compilada: {grid.n_cells} células em {time.perf_counter() - start:.2f}s")
+        except ValueError as e:
+            print(f"Aviso: tabela de previsões desativada: {e}")
+    
+    @property
+    def classes_(self):
+        """Classes do modelo, disponíveis também quando só o motor foi carregado"""
+        if self.engine is not None:
+            return self.engine.classes_
+        return self.model.classes_
+    
+    def _predict_proba(self, features):
+        """Calcula as probabilidades usando o motor selecionado
+        
+        Sem o modelo do scikit-learn (carga só dos arrays ou de um artefato), o
+        motor é usado mesmo com use_flat_engine=False.
+        """
+        if self.grid is not None:
+            return self.grid.predict_proba(features)
+        if self.model is None or (self.use_flat_engine and self.engine is not None):
+            return self.engine.predict_proba(features)
+        return self.model.predict_proba(features)
+    
+    def _assemble_features(self, rows):
+        """Monta a matriz (n, 4) de features a partir de tuplas (duracao, orcamento, tamanho_equipe, recursos)
+        
+        Caminho comum às previsões individuais, em lote e em streaming; categorias
+        desconhecidas geram UnknownCategoryError.
+        """
+        encode = self.recursos_encoder.encode
+        return np.array(
+            [(duracao, orcamento, tamanho_equipe, encode(recursos))
+             for duracao, orcamento, tamanho_equipe, recursos in rows],
+            dtype=np.float64
+        )
+    
+    def predict(self, duracao, orcamento, tamanho_equipe, recursos):
+        """Faz previsão para um novo projeto"""
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda!")
+        
+        # Preparar dados para previsão
+        features = self._assemble_features(((duracao, orcamento, tamanho_equipe, recursos),))
+        
+        # Fazer previsão
+        if self.single_pass or self.model is None:
+            probability = self._predict_proba(features)[0]
+            prediction = self.classes_[np.argmax(probability)]
+        else:
+            prediction = self.model.predict(features)[0]
+            probability = self.model.predict_proba(features)[0]
+        
+        return {
+            'prediction': int(prediction),
+            'probability_success': float(probability[1]),
+            'probability_failure': float(probability[0])
+        }
+    
+    def validate_project(self, project):
+        """Valida os campos de um projeto, retornando a mensagem de erro ou None"""
+        if not isinstance(project, dict):
+            return "Projeto deve ser um objeto com os campos: " + ", ".join(PROJECT_FIELDS)
+        
+        missing_fields = [field for field in PROJECT_FIELDS if field not in project]
+        if missing_fields:
+            return f"Campos obrigatórios faltando: {', '.join(missing_fields)}"
+        
+        for field, integer, message in NUMERIC_FIELD_RULES:
+            if parse_positive(project[field], integer) is None:
+                return message
+        
+        if self.recursos_encoder.code(project['recursos']) is None:
+            return self.recursos_encoder.error_message
+        
+        return None
+    
+    def predict_batch(self, projects):
+        """Faz previsões em lote com uma única passada pelo modelo
+        
+        Retorna uma lista na mesma ordem de `projects`; projetos inválidos
+        recebem um dicionário com a chave 'error' em vez da previsão.
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda!")
+        
+        results = [None] * len(projects)
+        valid_indices = []
+        for i, project in enumerate(projects):
+            error = self.validate_project(project)
+            if error:
+                results[i] = {'error': error}
+            else:
+                valid_indices.append(i)
+        
+        if not valid_indices:
+            return results
+        
+        rows = [
+            (project['duracao'], project['orcamento'], project['tamanho_equipe'], project['recursos'])
+            for project in (projects[i] for i in valid_indices)
+        ]
+        for i, result in zip(valid_indices, self.predict_rows(rows)):
+            results[i] = result
+        
+        return results
+    
+    def predict_rows(self, rows):
+        """Previsões para linhas já validadas (duracao, orcamento, tamanho_equipe, recursos)
+        
+        Uma única avaliação da floresta para todas as linhas; a classe é o
+        argmax das probabilidades.
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda!")
+        
+        # Montar a matriz (n, 4) de features
+        features = self._assemble_features(rows)
+        
+        probabilities = self._predict_proba(features)
+        predictions = self.classes_.take(np.argmax(probabilities, axis=1))
+        
+        return [
+            {
+                'prediction': int(prediction),
+                'probability_success': float(probability[1]),
+                'probability_failure': float(probability[0])
+            }
+            for prediction, probability in zip(predictions, probabilities)
+        ]
+    
+    def predict_dataframe(self, data):
+        """Faz previsões vetorizadas para um DataFrame no layout de projetos.csv
+        
+        Retorna um DataFrame alinhado ao índice de `data` com as colunas
+        Sucesso_previsto, Probabilidade_sucesso e Erro (vazia nas linhas válidas).
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda!")
+        
+        # Importação local: pandas só é necessário na avaliação de arquivos
+        import pandas as pd
+        
+        numeric = data[NUMERIC_COLUMNS].apply(pd.to_numeric, errors='coerce')
+        recursos = data['Recursos_disponiveis']
+        
+        recursos_codes = self.recursos_encoder.map_codes(recursos)
+        
+        numeric_ok = numeric.notna().all(axis=1)
+        recursos_ok = recursos_codes.notna()
+        valid = (numeric_ok & recursos_ok).to_numpy()
+        
+        result = pd.DataFrame({
+            'Sucesso_previsto': pd.array([pd.NA] * len(data), dtype='Int64'),
+            'Probabilidade_sucesso': np.nan,
+            'Erro': ''
+        }, index=data.index)
+        
+        if valid.any():
+            features = np.empty((int(valid.sum()), 4), dtype=np.float64)
+            features[:, :3] = numeric.to_numpy(dtype=np.float64)[valid]
+            features[:, 3] = recursos_codes.to_numpy(dtype=np.float64)[valid]
+            
+            probabilities = self._predict_proba(features)
+            predictions = self.classes_.take(np.argmax(probabilities, axis=1))
+            result.loc[valid, 'Sucesso_previsto'] = predictions
+            result.loc[valid, 'Probabilidade_sucesso'] = probabilities[:, 1]
+        
+        result.loc[~recursos_ok, 'Erro'] = self.recursos_encoder.error_message
+        result.loc[~numeric_ok, 'Erro'] = "Campos numéricos inválidos: " + ", ".join(NUMERIC_COLUMNS)
+        
+        return result
+    
+    @staticmethod
+    def engine_path_for(filepath):
+        """Caminho do arquivo com os arrays da floresta ao lado do modelo"""
+        return os.path.splitext(filepath)[0] + '.engine.joblib'
+    
+    def _engine_metadata(self, filepath):
+        """Metadados gravados com o motor, ligando-o ao arquivo do modelo de origem"""
+        stat = os.stat(filepath)
+        return {
+            'source': [stat.st_mtime_ns, stat.st_size],
+            'model_version': self.model_version,
+            'label_classes': self.recursos_encoder.classes_
+        }
+    
+    def _load_engine_only(self, filepath, mmap_mode):
+        """Carrega apenas os arrays da floresta, sem desserializar o modelo do scikit-learn
+        
+        Só vale quando o motor salvo foi exportado do arquivo atual do modelo;
+        caso contrário retorna False e o modelo completo é carregado.
+        """
+        engine_path = self.engine_path_for(filepath)
+        if not os.path.exists(engine_path):
+            return False
+        
+        try:
+            engine = FlatForest.load(engine_path, mmap_mode=mmap_mode)
+        except Exception as e:
+            # Arquivo incompleto ou corrompido: o modelo completo é carregado e o motor reexportado
+            print(f"Aviso: motor exportado inválido em {engine_path}: {e}")
+            return False
+        
+        stat = os.stat(filepath)
+        if (engine.metadata or {}).get('source') != [stat.st_mtime_ns, stat.st_size]:
+            return False
+        
+        self.model = None
+        self.engine = engine
+        self.label_encoder = None
+        self.compile_encoders(engine.metadata['label_classes'])
+        self.model_version = engine.metadata['model_version']
+        self.is_trained = True
+        return True
+    
+    def _load_shared_engine(self, filepath, mmap_mode):
+        """Exporta os arrays da floresta ao lado do modelo e os abre mapeados em memória"""
+        engine_path = self.engine_path_for(filepath)
+        
+        engine = self.compile_engine()
+        engine.metadata = self._engine_metadata(filepath)
+        try:
+            engine.save(engine_path)
+        except OSError as e:
+            # Sem permissão de escrita: mantém o motor compilado em memória
+            print(f"Aviso: não foi possível salvar {engine_path}: {e}")
+            return
+        
+        self.engine = FlatForest.load(engine_path, mmap_mode=mmap_mode)
+    
+    def _load_artifact(self, directory, mmap_mode, verify):
+        """Carrega um artefato versionado (diretório com manifest.json e arrays .npy)"""
+        engine, manifest = load_artifact(directory, mmap_mode=mmap_mode, verify=verify)
+        if manifest['feature_names'] != FEATURE_COLUMNS:
+            raise ValueError(f"Features do artefato incompatíveis: {', '.join(manifest['feature_names'])}")
+        
+        self.model = None
+        self.engine = engine
+        self.use_flat_engine = True
+        self.label_encoder = None
+        self.compile_encoders(manifest['label_classes'])
+        self.model_version = manifest['model_version']
+        self.manifest = manifest
+        self.is_trained = True
+    
+    def load_model(self, filepath, mmap_mode=None, verify=True):
+        """Carrega um modelo treinado
+        
+        `filepath` pode ser um .pkl salvo com save_model ou um diretório de
+        artefato salvo com save_artifact; o artefato é lido sem desserializar
+        objetos Python e, com verify=True, tem os checksums conferidos.
+        Com mmap_mode='r', os arrays da floresta são persistidos ao lado do modelo
+        e abertos mapeados em memória (somente leitura), de forma que workers
+        pré-fork compartilhem as mesmas páginas. Implica use_flat_engine=True.
+        Se os arrays já exportados correspondem ao arquivo do modelo, só eles são
+        lidos e o scikit-learn nem chega a ser importado.
+        Com use_grid=True, a tabela de previsões é compilada ao final da carga.
+        """
+        try:
+            start = time.perf_counter()
+            if os.path.isdir(filepath):
+                self._load_artifact(filepath, mmap_mode, verify)
+                self._compile_optional_grid()
+                self.load_duration = time.perf_counter() - start
+                print(f"Modelo carregado de: {filepath}")
+                return True
+            
+            if mmap_mode:
+                self.use_flat_engine = True
+                if self._load_engine_only(filepath, mmap_mode):
+                    self._compile_optional_grid()
+                    self.load_duration = time.perf_counter() - start
+                    print(f"Modelo carregado de: {filepath}")
+                    return True
+            
+            model_data = joblib.load(filepath)
+            self.model = model_data['model']
+            self.label_encoder = model_data['label_encoder']
+            self.compile_encoders()
+            self.is_trained = model_data['is_trained']
+            # Modelos salvos antes do versionamento usam os metadados do arquivo
+            stat = os.stat(filepath)
+            self.model_version = model_data.get('model_version') or f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+            if mmap_mode:
+                self._load_shared_engine(filepath, mmap_mode)
+            elif self.use_flat_engine:
+                self.compile_engine()
+            self._compile_optional_grid()
+            self.load_duration = time.perf_counter() - start
+            print(f"Modelo carregado de: {filepath}")
+            return True
+        except Exception as e:
+            print(f"Erro ao carregar modelo: {e}")
+            return False
@@ -1,57 +1,113 @@
+import argparse
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+import sklearn
+from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, classification_report
+from sklearn.base import clone
 import joblib
-import os
+import time
+from datetime import datetime
+from inference import FEATURE_COLUMNS, ProjectPredictor
+from model_artifact import save_artifact
+from flat_forest import FlatForest
+from model_registry import ModelRegistry
+from data_loader import load_projects, iter_project_chunks, encode_categories
 
-class ProjectSuccessPredictor:
-    def __init__(self):
+# Espaço de busca padrão de hiperparâmetros do Random Forest
+DEFAULT_PARAM_GRID = {
+    'n_estimators': [100, 200, 300],
+    'max_depth': [None, 5, 10],
+    'min_samples_leaf': [1, 2, 4]
+}
+
+class ProjectSuccessPredictor(ProjectPredictor):
+    """Preditor com treinamento completo, em blocos e incremental"""
+    
+    def __init__(self, single_pass=True, use_flat_engine=False, n_jobs=None, use_grid=False):
+        super().__init__(single_pass=single_pass, use_flat_engine=use_flat_engine, use_grid=use_grid)
         self.model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.label_encoder = LabelEncoder()
-        self.is_trained = False
+        # Núcleos usados no treinamento (-1 usa todos); a inferência segue em um núcleo
+        self.n_jobs = n_jobs
+        self.training_metrics = None
         
-    def load_data(self, filepath):
-        """Carrega os dados de projetos do arquivo CSV"""
+    def load_data(self, filepath, chunksize=None):
+        """Carrega os dados de projetos (CSV, Parquet ou Feather) com tipos compactos"""
         try:
-            data = pd.read_csv(filepath)
+            data = load_projects(filepath, chunksize=chunksize)
             return data
         except Exception as e:
             print(f"Erro ao carregar dados: {e}")
             return None
     
-    def preprocess_data(self, data):
-        """Prepara os dados para treinamento"""
-        # Fazer uma cópia dos dados
-        processed_data = data.copy()
+    def preprocess_data(self, data, fit_encoder=True):
+        """Prepara os dados para treinamento
         
-        # Codificar variáveis categóricas
-        processed_data['Recursos_disponiveis_encoded'] = self.label_encoder.fit_transform(processed_data['Recursos_disponiveis'])
+        As colunas numéricas são referenciadas sem cópia; apenas a coluna
+        categórica codificada é criada.
+        """
+        # Codificar variáveis categóricas (no retreino incremental, reaproveita o encoder)
+        recursos_encoded = encode_categories(data['Recursos_disponiveis'], self.label_encoder, fit=fit_encoder)
         
         # Selecionar features
-        features = ['Duracao_meses', 'Orcamento', 'Tamanho_equipe', 'Recursos_disponiveis_encoded']
-        X = processed_data[features]
-        y = processed_data['Sucesso']
+        X = pd.DataFrame({
+            'Duracao_meses': data['Duracao_meses'],
+            'Orcamento': data['Orcamento'],
+            'Tamanho_equipe': data['Tamanho_equipe'],
+            'Recursos_disponiveis_encoded': recursos_encoded
+        }, copy=False)
+        y = data['Sucesso']
         
         return X, y
     
-    def train(self, data_path):
-        """Treina o modelo com os dados fornecidos"""
+    def train(self, data_path, search=False, param_grid=None, cv=5, chunksize=None):
+        """Treina o modelo com os dados fornecidos
+        
+        Com search=True, faz uma busca de hiperparâmetros com validação cruzada
+        (GridSearchCV) sobre `param_grid`, avaliando os folds em paralelo.
+        Com `chunksize`, o CSV é lido em blocos desse número de linhas.
+        """
+        start = time.perf_counter()
+        
         # Carregar dados
-        data = self.load_data(data_path)
+        data = self.load_data(data_path, chunksize=chunksize)
         if data is None:
             return False
         
         # Preprocessar dados
         X, y = self.preprocess_data(data)
+        self.compile_encoders()
         
         # Dividir dados em treino e teste
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
         # Treinar modelo
-        self.model.fit(X_train, y_train)
+        if search:
+            # O paralelismo fica nos folds; cada floresta é construída em um núcleo
+            grid_search = GridSearchCV(
+                RandomForestClassifier(random_state=42),
+                param_grid or DEFAULT_PARAM_GRID,
+                cv=cv,
+                scoring='f1_weighted',
+                n_jobs=self.n_jobs
+            )
+            grid_search.fit(X_train, y_train)
+            self.model = grid_search.best_estimator_
+            
+            print("=== Busca de Hiperparâmetros ===")
+            print(f"Melhores parâmetros: {grid_search.best_params_}")
+            print(f"F1-Score médio na validação cruzada: {grid_search.best_score_:.4f}\n")
+        else:
+            self.model.set_params(n_jobs=self.n_jobs)
+            self.model.fit(X_train, y_train)
+        
+        # Previsões individuais não compensam o custo de despachar threads, e a
+        # soma em ordem fixa mantém as probabilidades determinísticas
+        self.model.set_params(n_jobs=None)
+        training_time = time.perf_counter() - start
         
         # Fazer previsões
         y_pred = self.model.predict(X_test)
@@ -67,6 +123,7 @@ class ProjectSuccessPredictor:
         print(f"Precisão: {precision:.4f}")
         print(f"Recall: {recall:.4f}")
         print(f"F1-Score: {f1:.4f}")
+        print(f"Tempo de treinamento: {training_time:.2f}s")
         print("\n=== Relatório de Classificação ===")
         print(classification_report(y_test, y_pred))
         
@@ -79,30 +136,217 @@ class ProjectSuccessPredictor:
         print("\n=== Importância das Features ===")
         print(feature_importance)
         
+        self.training_metrics = {
+            'accuracy': accuracy,
+            'precision': precision,
+            'recall': recall,
+            'f1': f1,
+            'training_time_seconds': training_time
+        }
         self.is_trained = True
+        self.model_version = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        if self.use_flat_engine:
+            self.compile_engine()
+        self._compile_optional_grid()
         return True
     
-    def predict(self, duracao, orcamento, tamanho_equipe, recursos):
-        """Faz previsão para um novo projeto"""
-        if not self.is_trained:
-            raise ValueError("Modelo não foi treinado ainda!")
+    def _holdout_masks(self, data_path, chunksize, test_size):
+        """Percorre os blocos marcando as linhas de teste
+
+        A semente fixa gera a mesma divisão a cada passagem pelo arquivo.
+        """
+        rng = np.random.default_rng(42)
+        for chunk in iter_project_chunks(data_path, chunksize):
+            yield chunk, rng.random(len(chunk)) < test_size
+    
+    def train_out_of_core(self, data_path, chunksize=500000, test_size=0.2, n_estimators=None):
+        """Treina lendo os dados do disco em blocos, sem carregar o arquivo inteiro
+        
+        Uma primeira passagem lê apenas as colunas categóricas para ajustar o
+        LabelEncoder e contar as linhas. Em seguida, cada bloco treina uma
+        subfloresta e as árvores são reunidas em um único RandomForest (cerca de
+        `n_estimators` no total). Uma fração `test_size` de cada bloco é separada
+        para teste e as métricas são acumuladas bloco a bloco em uma matriz de
+        confusão, em uma última passagem.
+        """
+        start = time.perf_counter()
+        
+        try:
+            # 1ª passagem: categorias, classes e total de linhas
+            categories, classes, n_rows = set(), set(), 0
+            for chunk in iter_project_chunks(data_path, chunksize, ['Recursos_disponiveis', 'Sucesso']):
+                categories.update(chunk['Recursos_disponiveis'].unique())
+                classes.update(chunk['Sucesso'].unique())
+                n_rows += len(chunk)
+        except Exception as e:
+            print(f"Erro ao carregar dados: {e}")
+            return False
+        
+        if n_rows == 0:
+            print("Erro ao carregar dados: arquivo sem projetos")
+            return False
+        
+        self.label_encoder.fit(sorted(categories))
+        self.compile_encoders()
+        classes = sorted(classes)
+        n_chunks = -(-n_rows // chunksize)
+        n_estimators = n_estimators or self.model.n_estimators
+        trees_per_chunk = max(1, -(-n_estimators // n_chunks))
+        
+        # 2ª passagem: uma subfloresta por bloco, com as linhas de treino
+        forest = None
+        pending = None
+        skipped = 0
+        for i, (chunk, test_mask) in enumerate(self._holdout_masks(data_path, chunksize, test_size)):
+            train_rows = chunk[~test_mask]
+            if pending is not None:
+                train_rows = pd.concat([pending, train_rows], ignore_index=True)
+                pending = None
+            
+            # Árvores ajustadas a um subconjunto das classes não podem ser combinadas;
+            # o bloco é acumulado ao seguinte até conter todas as classes
+            if sorted(train_rows['Sucesso'].unique()) != classes:
+                pending = train_rows
+                continue
+            
+            X, y = self.preprocess_data(train_rows, fit_encoder=False)
+            sub_forest = clone(self.model).set_params(
+                n_estimators=trees_per_chunk, random_state=42 + i, n_jobs=self.n_jobs, warm_start=False
+            )
+            sub_forest.fit(X, y)
+            
+            if forest is None:
+                forest = sub_forest
+            else:
+                forest.estimators_.extend(sub_forest.estimators_)
+        
+        if pending is not None:
+            skipped = len(pending)
+        if forest is None:
+            print("Erro no treinamento: nenhum bloco contém exemplos de todas as classes de Sucesso")
+            return False
         
-        # Codificar recursos
-        recursos_encoded = self.label_encoder.transform([recursos])[0]
+        forest.set_params(n_estimators=len(forest.estimators_), n_jobs=None)
+        self.model = forest
+        training_time = time.perf_counter() - start
         
-        # Preparar dados para previsão
-        features = np.array([[duracao, orcamento, tamanho_equipe, recursos_encoded]])
+        # 3ª passagem: métricas acumuladas nas linhas de teste de cada bloco
+        confusion = np.zeros((len(classes), len(classes)), dtype=np.int64)
+        for chunk, test_mask in self._holdout_masks(data_path, chunksize, test_size):
+            if not test_mask.any():
+                continue
+            X_test, y_test = self.preprocess_data(chunk[test_mask], fit_encoder=False)
+            y_pred = self.model.predict(X_test)
+            true_index = np.searchsorted(classes, y_test.to_numpy())
+            pred_index = np.searchsorted(classes, y_pred)
+            np.add.at(confusion, (true_index, pred_index), 1)
         
-        # Fazer previsão
-        prediction = self.model.predict(features)[0]
-        probability = self.model.predict_proba(features)[0]
+        self.training_metrics = self._confusion_metrics(confusion, training_time)
+        self.training_metrics.update({
+            'rows': n_rows,
+            'chunks': n_chunks,
+            'skipped_rows': skipped
+        })
         
+        print("=== Treinamento em Blocos ===")
+        print(f"Projetos: {n_rows} em {n_chunks} blocos de até {chunksize} linhas")
+        print(f"Árvores: {len(self.model.estimators_)} ({trees_per_chunk} por bloco)")
+        if skipped:
+            print(f"Projetos descartados no último bloco (sem todas as classes): {skipped}")
+        print("\n=== Métricas do Modelo ===")
+        print(f"Acurácia: {self.training_metrics['accuracy']:.4f}")
+        print(f"Precisão: {self.training_metrics['precision']:.4f}")
+        print(f"Recall: {self.training_metrics['recall']:.4f}")
+        print(f"F1-Score: {self.training_metrics['f1']:.4f}")
+        print(f"Projetos de teste: {int(confusion.sum())}")
+        print(f"Tempo de treinamento: {training_time:.2f}s")
+        
+        self.is_trained = True
+        self.model_version = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        if self.use_flat_engine:
+            self.compile_engine()
+        self._compile_optional_grid()
+        return True
+    
+    @staticmethod
+    def _confusion_metrics(confusion, training_time):
+        """Acurácia e métricas ponderadas pelo suporte, a partir da matriz de confusão"""
+        support = confusion.sum(axis=1)
+        predicted = confusion.sum(axis=0)
+        hits = np.diag(confusion)
+        total = support.sum()
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(predicted > 0, hits / predicted, 0.0)
+            recall = np.where(support > 0, hits / support, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        
+        weights = support / total if total else support
         return {
-            'prediction': int(prediction),
-            'probability_success': float(probability[1]),
-            'probability_failure': float(probability[0])
+            'accuracy': float(hits.sum() / total) if total else 0.0,
+            'precision': float(precision @ weights),
+            'recall': float(recall @ weights),
+            'f1': float(f1 @ weights),
+            'training_time_seconds': training_time
         }
     
+    def update(self, data_path, n_new_estimators=10, replace_oldest=False, save_path=None):
+        """Retreina incrementalmente com projetos encerrados desde o último treino
+        
+        Apenas os novos dados são processados: o LabelEncoder existente é
+        reaproveitado e `n_new_estimators` árvores são ajustadas aos novos
+        projetos e adicionadas à floresta via warm_start. Com replace_oldest=True,
+        a mesma quantidade de árvores mais antigas é descartada, mantendo o
+        tamanho da floresta. Com `save_path`, a nova versão é salva em seguida.
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda!")
+        
+        start = time.perf_counter()
+        
+        data = self.load_data(data_path)
+        if data is None:
+            return False
+        
+        unknown = set(data['Recursos_disponiveis']) - set(self.label_encoder.classes_)
+        if unknown:
+            raise ValueError(f"Categorias desconhecidas em Recursos_disponiveis: {', '.join(sorted(map(str, unknown)))}")
+        
+        # Árvores ajustadas a um subconjunto das classes não podem ser combinadas
+        if set(data['Sucesso']) != set(self.model.classes_):
+            raise ValueError("Os novos projetos precisam conter exemplos de todas as classes de Sucesso")
+        
+        X, y = self.preprocess_data(data, fit_encoder=False)
+        
+        # Desempenho do modelo atual nos projetos que acabaram de ser encerrados
+        accuracy_before = accuracy_score(y, self.model.predict(X))
+        
+        n_estimators = len(self.model.estimators_)
+        self.model.set_params(warm_start=True, n_estimators=n_estimators + n_new_estimators, n_jobs=self.n_jobs)
+        self.model.fit(X, y)
+        self.model.set_params(warm_start=False, n_jobs=None)
+        
+        if replace_oldest:
+            self.model.estimators_ = self.model.estimators_[n_new_estimators:]
+            self.model.set_params(n_estimators=len(self.model.estimators_))
+        
+        update_time = time.perf_counter() - start
+        
+        print("=== Retreino Incremental ===")
+        print(f"Novos projetos: {len(data)}")
+        print(f"Acurácia do modelo anterior nos novos projetos: {accuracy_before:.4f}")
+        print(f"Árvores adicionadas: {n_new_estimators} (total: {len(self.model.estimators_)})")
+        print(f"Tempo de retreino: {update_time:.2f}s")
+        
+        self.model_version = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        if self.use_flat_engine:
+            self.compile_engine()
+        self._compile_optional_grid()
+        
+        if save_path:
+            self.save_model(save_path)
+        return True
+    
     def save_model(self, filepath):
         """Salva o modelo treinado"""
         if not self.is_trained:
@@ -111,40 +355,82 @@ class ProjectSuccessPredictor:
         model_data = {
             'model': self.model,
             'label_encoder': self.label_encoder,
-            'is_trained': self.is_trained
+            'is_trained': self.is_trained,
+            'model_version': self.model_version
         }
         
         joblib.dump(model_data, filepath)
         print(f"Modelo salvo em: {filepath}")
     
-    def load_model(self, filepath):
-        """Carrega um modelo treinado"""
-        try:
-            model_data = joblib.load(filepath)
-            self.model = model_data['model']
-            self.label_encoder = model_data['label_encoder']
-            self.is_trained = model_data['is_trained']
-            print(f"Modelo carregado de: {filepath}")
-            return True
-        except Exception as e:
-            print(f"Erro ao carregar modelo: {e}")
-            return False
+    def save_artifact(self, directory):
+        """Salva o modelo como artefato versionado para inferência
+        
+        O diretório contém os arrays da floresta como arquivos .npy e um
+        manifest.json com a ordem das features, as classes do encoder, as
+        métricas de treinamento, os checksums e a versão do scikit-learn.
+        Carregue com load_model(directory, mmap_mode='r'). O .pkl continua
+        necessário para o retreino incremental.
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda!")
+        
+        return save_artifact(FlatForest.from_forest(self.model), directory, {
+            'model_version': self.model_version,
+            'feature_names': FEATURE_COLUMNS,
+            'label_classes': [str(label) for label in self.label_encoder.classes_],
+            'training_metrics': self.training_metrics,
+            'sklearn_version': sklearn.__version__,
+            'numpy_version': np.__version__
+        })
 
 def main():
+    parser = argparse.ArgumentParser(description='Treinamento do modelo de previsão de sucesso de projetos')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Núcleos usados no treinamento (-1 usa todos)')
+    parser.add_argument('--search', action='store_true', help='Busca de hiperparâmetros com validação cruzada')
+    parser.add_argument('--update', metavar='CSV', help='Retreino incremental do modelo salvo com novos projetos')
+    parser.add_argument('--new-trees', type=int, default=10, help='Árvores adicionadas no retreino incremental')
+    parser.add_argument('--replace-oldest', action='store_true', help='Descarta as árvores mais antigas no retreino incremental')
+    parser.add_argument('--registry', metavar='DIR', help='Publica o modelo treinado como nova versão no registro')
+    parser.add_argument('--artifact', metavar='DIR', help='Também salva o modelo como artefato versionado (manifest + arrays .npy)')
+    parser.add_argument('--data', default='../data/projetos.csv', help='Dados de treinamento (CSV, Parquet ou Feather)')
+    parser.add_argument('--chunksize', type=int, help='Lê o CSV de treinamento em blocos desse número de linhas')
+    parser.add_argument('--out-of-core', action='store_true',
+                        help='Treina bloco a bloco (--chunksize), sem carregar todos os dados na memória')
+    args = parser.parse_args()
+    
+    if args.update:
+        predictor = ProjectSuccessPredictor(n_jobs=args.n_jobs)
+        model_path = "project_success_model.pkl"
+        if predictor.load_model(model_path):
+            if predictor.update(args.update, args.new_trees, args.replace_oldest, save_path=model_path):
+                if args.artifact:
+                    predictor.save_artifact(args.artifact)
+                if args.registry:
+                    ModelRegistry(args.registry).publish(predictor, {'source': 'update', 'data_path': args.update})
+        return
+    
     # Inicializar o preditor
-    predictor = ProjectSuccessPredictor()
+    predictor = ProjectSuccessPredictor(n_jobs=args.n_jobs)
     
     # Caminho dos dados
-    data_path = "../data/projetos.csv"
+    data_path = args.data
     
     # Treinar o modelo
     print("Iniciando treinamento do modelo...")
-    if predictor.train(data_path):
+    if args.out_of_core:
+        trained = predictor.train_out_of_core(data_path, chunksize=args.chunksize or 500000)
+    else:
+        trained = predictor.train(data_path, search=args.search, chunksize=args.chunksize)
+    if trained:
         print("Modelo treinado com sucesso!")
         
         # Salvar o modelo
         model_path = "project_success_model.pkl"
         predictor.save_model(model_path)
+        if args.artifact:
+            predictor.save_artifact(args.artifact)
+        if args.registry:
+            ModelRegistry(args.registry).publish(predictor, {'source': 'train', 'data_path': data_path})
         
         # Teste de previsão
         print("\n=== Teste de Previsão ===")
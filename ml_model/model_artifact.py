@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from flat_forest import ARRAY_FIELDS, FlatForest
+
+# Versão do formato do diretório; incrementada a cada mudança incompatível
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILENAME = 'manifest.json'
+
+# Arrays de índices de nós, gravados com o menor inteiro que comporta a floresta
+NODE_INDEX_FIELDS = ('left', 'right', 'roots')
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _compact(field, array, n_nodes):
+    """Reduz os arrays de índices ao menor tipo inteiro necessário
+
+    Limiares e valores das folhas ficam em float64, para que as previsões
+    continuem idênticas às do scikit-learn.
+    """
+    if field in NODE_INDEX_FIELDS:
+        return array.astype(np.int32 if n_nodes < 2 ** 31 else np.int64)
+    if field == 'feature':
+        return array.astype(np.min_scalar_type(int(array.max(initial=0))))
+    return array
+
+
+def content_hash(arrays):
+    """Hash do conteúdo do modelo, derivado dos hashes de cada array"""
+    digest = hashlib.sha256()
+    for name in sorted(arrays):
+        digest.update(f"{name}:{arrays[name]['sha256']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def save_artifact(engine, directory, metadata):
+    """Grava a floresta como arquivos .npy e um manifest.json com os metadados
+
+    O diretório é montado ao lado do destino e trocado ao final, de modo que
+    leitores nunca encontram um artefato incompleto. Retorna o manifest.
+    """
+    directory = os.path.abspath(directory)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=f'.{os.path.basename(directory)}.')
+    try:
+        # mkdtemp cria o diretório visível apenas para o dono
+        os.chmod(tmp_dir, 0o755)
+        n_nodes = len(engine.feature)
+        arrays = {}
+        for field in ARRAY_FIELDS:
+            array = np.ascontiguousarray(_compact(field, getattr(engine, field), n_nodes))
+            filename = f'{field}.npy'
+            path = os.path.join(tmp_dir, filename)
+            np.save(path, array, allow_pickle=False)
+            arrays[field] = {
+                'file': filename,
+                'dtype': array.dtype.str,
+                'shape': list(array.shape),
+                'sha256': _sha256(path)
+            }
+
+        manifest = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            **metadata,
+            'n_estimators': engine.n_estimators,
+            'max_depth': int(engine.max_depth),
+            'arrays': arrays,
+            'content_hash': content_hash(arrays)
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        # Arquivos já mapeados por outros processos continuam válidos após a troca
+        if os.path.exists(directory):
+            old_dir = tempfile.mkdtemp(dir=parent, prefix=f'.{os.path.basename(directory)}.old.')
+            os.replace(directory, os.path.join(old_dir, 'artifact'))
+            os.replace(tmp_dir, directory)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            os.replace(tmp_dir, directory)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    print(f"Artefato salvo em: {directory}")
+    return manifest
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_FILENAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Formato de artefato não suportado: {manifest.get('format_version')}")
+    return manifest
+
+
+def load_artifact(directory, mmap_mode='r', verify=True):
+    """Carrega a floresta de um artefato, sem desserializar objetos Python
+
+    Com verify=True, o SHA-256 de cada array é conferido com o manifest antes
+    do uso. Com mmap_mode='r', os arrays são mapeados em memória e
+    compartilhados entre processos. Retorna (FlatForest, manifest).
+    """
+    manifest = read_manifest(directory)
+
+    loaded = {}
+    for field in ARRAY_FIELDS:
+        entry = manifest['arrays'][field]
+        path = os.path.join(directory, entry['file'])
+        if verify and _sha256(path) != entry['sha256']:
+            raise ValueError(f"Checksum inválido no artefato: {entry['file']}")
+
+        array = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+        if array.dtype.str != entry['dtype'] or list(array.shape) != entry['shape']:
+            raise ValueError(f"Array incompatível com o manifest: {entry['file']}")
+        loaded[field] = array
+
+    if verify and content_hash(manifest['arrays']) != manifest['content_hash']:
+        raise ValueError("Hash de conteúdo do artefato não confere com o manifest")
+
+    engine = FlatForest(
+        feature=loaded['feature'],
+        threshold=loaded['threshold'],
+        left=loaded['left'],
+        right=loaded['right'],
+        value=loaded['value'],
+        roots=loaded['roots'],
+        max_depth=manifest['max_depth'],
+        classes=loaded['classes_']
+    )
+    return engine, manifest
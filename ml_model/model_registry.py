@@ -0,0 +1,128 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+MODEL_FILENAME = 'model.pkl'
+ARTIFACT_DIRNAME = 'artifact'
+METADATA_FILENAME = 'metadata.json'
+LATEST_FILENAME = 'LATEST'
+
+
+class ModelRegistry:
+    """Registro em disco de modelos versionados
+
+    Estrutura do diretório:
+
+        <root>/
+            LATEST                  # versão ativa
+            <versão>/model.pkl      # modelo salvo com save_model
+            <versão>/artifact/      # artefato de inferência salvo com save_artifact
+            <versão>/metadata.json  # métricas e informações da versão
+
+    Cada versão é gravada em um diretório temporário e renomeada ao final, e o
+    ponteiro LATEST é substituído com os.replace, de modo que leitores nunca
+    encontram uma versão incompleta.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def version_dir(self, version):
+        return os.path.join(self.root, version)
+
+    def model_path(self, version):
+        return os.path.join(self.version_dir(version), MODEL_FILENAME)
+
+    def artifact_path(self, version):
+        return os.path.join(self.version_dir(version), ARTIFACT_DIRNAME)
+
+    def serving_path(self, version):
+        """Caminho usado na inferência: o artefato, ou o .pkl em versões antigas"""
+        artifact_path = self.artifact_path(version)
+        return artifact_path if os.path.isdir(artifact_path) else self.model_path(version)
+
+    def versions(self):
+        """Versões publicadas, da mais antiga para a mais recente"""
+        return sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith('.') and os.path.isfile(os.path.join(self.root, name, METADATA_FILENAME))
+        )
+
+    def metadata(self, version):
+        with open(os.path.join(self.version_dir(version), METADATA_FILENAME), encoding='utf-8') as f:
+            return json.load(f)
+
+    def latest_version(self):
+        """Versão ativa, ou None se nada foi publicado"""
+        try:
+            with open(os.path.join(self.root, LATEST_FILENAME), encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_latest(self, version):
+        """Aponta LATEST para uma versão publicada (também serve para rollback)"""
+        if version not in self.versions():
+            raise ValueError(f"Versão não encontrada no registro: {version}")
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.LATEST')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(version)
+        # mkstemp cria o arquivo legível apenas pelo dono; a API pode rodar com outro usuário
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, os.path.join(self.root, LATEST_FILENAME))
+
+    def publish(self, predictor, metadata=None, make_latest=True):
+        """Salva o preditor como uma nova versão e retorna o identificador da versão"""
+        if not predictor.is_trained:
+            raise ValueError("Modelo não foi treinado ainda!")
+
+        if not predictor.model_version:
+            predictor.model_version = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        version = predictor.model_version
+        if os.path.exists(self.version_dir(version)):
+            raise ValueError(f"Versão já publicada: {version}")
+
+        tmp_dir = tempfile.mkdtemp(dir=self.root, prefix=f'.{version}.')
+        try:
+            # mkdtemp cria o diretório visível apenas para o dono
+            os.chmod(tmp_dir, 0o755)
+            predictor.save_model(os.path.join(tmp_dir, MODEL_FILENAME))
+            manifest = predictor.save_artifact(os.path.join(tmp_dir, ARTIFACT_DIRNAME))
+            version_metadata = {
+                'version': version,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'n_estimators': len(predictor.model.estimators_),
+                'content_hash': manifest['content_hash'],
+                'training_metrics': predictor.training_metrics,
+                **(metadata or {})
+            }
+            with open(os.path.join(tmp_dir, METADATA_FILENAME), 'w', encoding='utf-8') as f:
+                json.dump(version_metadata, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_dir, self.version_dir(version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        if make_latest:
+            self.set_latest(version)
+        print(f"Versão {version} publicada em: {self.root}")
+        return version
+
+    def load(self, version=None, **predictor_kwargs):
+        """Carrega uma versão (por padrão, a ativa) em um novo preditor"""
+        version = version or self.latest_version()
+        if version is None:
+            print(f"Nenhuma versão publicada em: {self.root}")
+            return None
+
+        # Importação local: só o carregamento precisa do preditor
+        from inference import ProjectPredictor
+
+        predictor = ProjectPredictor(**predictor_kwargs)
+        if not predictor.load_model(self.serving_path(version)):
+            return None
+        return predictor
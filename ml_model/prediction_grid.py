@@ -0,0 +1,92 @@
+import numpy as np
+
+# Limite padrão de células da tabela; acima disso a compilação é recusada
+DEFAULT_MAX_CELLS = 1_000_000
+
+# Células avaliadas por vez na compilação, para limitar a memória de FlatForest.apply
+BUILD_CHUNK_SIZE = 8192
+
+
+class PredictionGrid:
+    """Tabela com a probabilidade exata de cada célula do espaço de entrada
+
+    Cada árvore só compara uma feature com seus limiares, então os limiares de
+    todas as árvores dividem cada feature em intervalos; dentro de uma célula
+    (um intervalo por feature) todas as árvores chegam às mesmas folhas. A
+    tabela guarda o predict_proba de cada célula, e a previsão passa a ser um
+    searchsorted por feature e uma indexação, independentemente do número de
+    árvores. As probabilidades são idênticas bit a bit às da floresta.
+    """
+
+    def __init__(self, thresholds, table, classes):
+        # Limiares ordenados e sem repetição de cada feature (float64)
+        self.thresholds = thresholds
+        # Probabilidades, shape (células da feature 0, ..., células da feature n-1, n_classes)
+        self.table = table
+        self.classes_ = classes
+
+    @property
+    def n_cells(self):
+        return int(np.prod(self.table.shape[:-1]))
+
+    @staticmethod
+    def split_thresholds(engine, n_features):
+        """Limiares distintos usados em cada feature pelos nós internos da floresta"""
+        internal = engine.left != np.arange(len(engine.left))
+        features = engine.feature[internal]
+        thresholds = engine.threshold[internal]
+        return [np.unique(thresholds[features == f]).astype(np.float64) for f in range(n_features)]
+
+    @staticmethod
+    def representatives(thresholds):
+        """Um valor float64 dentro de cada intervalo definido pelos limiares
+
+        O intervalo k é (t[k-1], t[k]], então t[k] o representa; o último,
+        acima do maior limiar, é representado pelo float64 seguinte. Os
+        valores não passam pela conversão para float32, que poderia levá-los
+        para o intervalo vizinho.
+        """
+        if len(thresholds) == 0:
+            return np.zeros(1)
+        return np.append(thresholds, np.nextafter(thresholds[-1], np.inf))
+
+    @classmethod
+    def from_forest(cls, engine, n_features, max_cells=DEFAULT_MAX_CELLS):
+        """Compila a tabela a partir de uma FlatForest"""
+        thresholds = cls.split_thresholds(engine, n_features)
+        shape = tuple(len(t) + 1 for t in thresholds)
+        n_cells = int(np.prod(shape))
+        if n_cells > max_cells:
+            raise ValueError(
+                f"Tabela de previsões com {n_cells} células excede o limite de {max_cells} "
+                f"(intervalos por feature: {', '.join(map(str, shape))})"
+            )
+
+        axes = [cls.representatives(t) for t in thresholds]
+        n_classes = len(engine.classes_)
+        table = np.empty((n_cells, n_classes), dtype=np.float64)
+        for start in range(0, n_cells, BUILD_CHUNK_SIZE):
+            cells = np.unravel_index(np.arange(start, min(start + BUILD_CHUNK_SIZE, n_cells)), shape)
+            X = np.column_stack([axis[index] for axis, index in zip(axes, cells)])
+            table[start:start + len(X)] = engine.predict_proba_uncast(X)
+
+        return cls(thresholds, table.reshape(shape + (n_classes,)), engine.classes_)
+
+    def cell_indices(self, X):
+        """Índice da célula de cada amostra, com as entradas convertidas para float32 como no scikit-learn"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        # x <= t é comparado em float64 após a conversão para float32; o número
+        # de limiares estritamente menores que x é o índice do intervalo
+        return tuple(
+            np.searchsorted(thresholds, X[:, f].astype(np.float64), side='left')
+            for f, thresholds in enumerate(self.thresholds)
+        )
+
+    def predict_proba(self, X):
+        """Probabilidades de cada classe, idênticas às da floresta"""
+        return self.table[self.cell_indices(X)]
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
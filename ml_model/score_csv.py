@@ -0,0 +1,93 @@
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from inference import ProjectPredictor
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'project_success_model.pkl')
+
+# Preditor carregado uma única vez em cada processo do pool
+_worker_predictor = None
+
+
+def _init_worker(model_path, use_grid):
+    """Carrega o modelo no processo do pool"""
+    global _worker_predictor
+    _worker_predictor = ProjectPredictor(use_grid=use_grid)
+    if not _worker_predictor.load_model(model_path, mmap_mode='r'):
+        raise RuntimeError(f"Não foi possível carregar o modelo: {model_path}")
+
+
+def _score_chunk(chunk):
+    """Avalia um bloco do CSV no processo do pool"""
+    return pd.concat([chunk, _worker_predictor.predict_dataframe(chunk)], axis=1)
+
+
+def iter_scored_chunks(chunks, model_path, workers, use_grid=False):
+    """Distribui os blocos entre os processos, devolvendo-os na ordem de entrada
+
+    No máximo `2 * workers` blocos ficam em processamento ao mesmo tempo, para
+    que a memória não cresça com o tamanho do arquivo.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path, use_grid)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_score_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_csv(input_path, output_path, model_path=DEFAULT_MODEL_PATH, chunksize=100000, workers=None,
+              use_grid=False):
+    """Avalia um CSV no layout de projetos.csv e grava as previsões em `output_path`
+
+    Com use_grid=True, cada worker compila a tabela de previsões (PredictionGrid)
+    quando ela cabe no limite padrão de células.
+    """
+    workers = workers or os.cpu_count()
+
+    # Carregar o modelo uma vez no processo principal valida o arquivo e exporta
+    # os arrays da floresta, que os workers abrem mapeados em memória
+    if not ProjectPredictor().load_model(model_path, mmap_mode='r'):
+        return None
+
+    total_rows = 0
+    chunks = pd.read_csv(input_path, chunksize=chunksize)
+    for i, scored in enumerate(iter_scored_chunks(chunks, model_path, workers, use_grid)):
+        scored.to_csv(output_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        total_rows += len(scored)
+
+    return total_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Avaliação em lote de projetos a partir de um CSV')
+    parser.add_argument('input', help='CSV de entrada no layout de data/projetos.csv')
+    parser.add_argument('output', help='CSV de saída com as previsões')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help='Caminho do modelo treinado')
+    parser.add_argument('--chunksize', type=int, default=100000, help='Linhas lidas por bloco')
+    parser.add_argument('--workers', type=int, default=None, help='Processos do pool (padrão: número de CPUs)')
+    parser.add_argument('--grid', action='store_true', help='Usa a tabela de previsões pré-computada')
+    args = parser.parse_args()
+
+    print(f"Avaliando {args.input}...")
+    start = time.perf_counter()
+    total_rows = score_csv(args.input, args.output, args.model, args.chunksize, args.workers, args.grid)
+    elapsed = time.perf_counter() - start
+
+    if total_rows is None:
+        print("Erro ao carregar modelo!")
+        return
+
+    print(f"{total_rows} projetos avaliados em {elapsed:.2f}s")
+    print(f"Previsões salvas em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+import unicodedata
+
+
+def normalize_category(value):
+    """Forma usada na comparação de categorias: sem acentos, minúsculas e espaços simples"""
+    decomposed = unicodedata.normalize('NFKD', value)
+    without_accents = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(without_accents.casefold().split())